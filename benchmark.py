@@ -0,0 +1,179 @@
+import argparse
+import json
+import math
+import timeit
+
+import django
+from django.conf import settings
+
+
+class QuickDjangoBenchmark:
+    """
+    Time serialization use-cases, without a fully-configured project.
+
+    Example usage:
+
+        $ python benchmark.py
+        $ python benchmark.py geometry_encoding --number 10
+
+    Benchmarks are methods named ``bench_<name>``, that return a dict of
+    callables to compare.
+    """
+    def __init__(self, names, number):
+        settings.configure(
+            INSTALLED_APPS=(
+                'django.contrib.contenttypes',
+                'django.contrib.auth',
+            ),
+            DATABASES={
+                'default': {
+                    'ENGINE': 'django.db.backends.sqlite3',
+                    'NAME': ':memory:',
+                }
+            },
+            SECRET_KEY="not-secret",
+        )
+        django.setup()
+
+        names = names or sorted(n[len('bench_'):] for n in dir(self)
+                                if n.startswith('bench_'))
+        for name in names:
+            print(name)
+            candidates = getattr(self, 'bench_%s' % name)()
+            for label, func in candidates.items():
+                duration = min(timeit.repeat(func, number=number, repeat=3))
+                print('    %-20s %8.2f ms' % (label, duration * 1000 / number))
+
+    def polygons(self, count=200, points=500):
+        from django.contrib.gis.geos import MultiPolygon, Polygon
+
+        polygons = []
+        for i in range(count):
+            ring = [(i + math.cos(2 * math.pi * j / points),
+                     45 + math.sin(2 * math.pi * j / points))
+                    for j in range(points)]
+            ring.append(ring[0])
+            polygons.append(MultiPolygon(Polygon(ring), srid=4326))
+        return [{'geom': geom, 'name': 'polygon %s' % i}
+                for i, geom in enumerate(polygons)]
+
+    def lines(self, count=2000, points=10):
+        from django.contrib.gis.geos import LineString
+
+        return [{'geom': LineString([(700000 + i + j, 6600000 + j) for j in range(points)],
+                                    srid=2154)}
+                for i in range(count)]
+
+    def users(self, count=2000):
+        """ Users with a point (as WKT), in an in-memory SQLite database """
+        from django.contrib.auth.models import User
+        from django.core.management import call_command
+        from django.db.models import Value
+
+        call_command('migrate', verbosity=0)
+        if not User.objects.exists():
+            User.objects.bulk_create([
+                User(username='user%s' % i, email='user%s@example.com' % i)
+                for i in range(count)
+            ])
+        return User.objects.annotate(geom=Value('POINT (1 2)'))
+
+    def bench_geometry_encoding(self):
+        from djgeojson.serializers import DjangoGeoJSONEncoder, Serializer
+
+        class GeoJSONTextEncoder(DjangoGeoJSONEncoder):
+            """ Parse the GeoJSON text of geometries, like in 4.2 """
+            def default(self, o):
+                if hasattr(o, 'geojson'):
+                    return json.loads(o.geojson)
+                return super(GeoJSONTextEncoder, self).default(o)
+
+        objects = self.polygons()
+        geometries = [obj['geom'] for obj in objects]
+        return {
+            'geojson text': lambda: json.dumps(geometries, cls=GeoJSONTextEncoder),
+            'wkb': lambda: json.dumps(geometries, cls=DjangoGeoJSONEncoder),
+            'serializer': lambda: Serializer().serialize(objects),
+        }
+
+    def bench_precision(self):
+        from djgeojson.serializers import Serializer
+
+        objects = self.polygons()
+        return {
+            'default': lambda: Serializer().serialize(objects),
+            'precision': lambda: Serializer().serialize(objects, precision=5),
+        }
+
+    def bench_numpy(self):
+        from unittest import mock
+
+        from djgeojson import serializers
+
+        objects = self.polygons()
+
+        def pure(**options):
+            with mock.patch.object(serializers, 'numpy', None):
+                return serializers.Serializer().serialize(objects, **options)
+        return {
+            'pure': lambda: pure(),
+            'numpy': lambda: serializers.Serializer().serialize(objects),
+            'pure precision': lambda: pure(precision=5),
+            'numpy precision': lambda: serializers.Serializer().serialize(objects, precision=5),
+        }
+
+    def bench_reprojection(self):
+        from djgeojson.serializers import (
+            Serializer,
+            geometry_to_geojson,
+            get_coord_transform,
+            transform_geometries,
+        )
+
+        objects = self.lines()
+        geometries = [obj['geom'] for obj in objects]
+        return {
+            'transform()': lambda: [geometry_to_geojson(g.transform(4326, clone=True))
+                                    for g in geometries],
+            'cached transform': lambda: [geometry_to_geojson(g.transform(
+                get_coord_transform(2154, 4326), clone=True)) for g in geometries],
+            'batched': lambda: transform_geometries(geometries, 4326),
+            'serializer': lambda: Serializer().serialize(objects),
+        }
+
+    def bench_deserialization(self):
+        from django.contrib.gis.geos import GEOSGeometry
+
+        from djgeojson.serializers import geojson_to_wkb, geometry_to_geojson
+
+        geometries = [geometry_to_geojson(obj['geom']) for obj in self.polygons()]
+        return {
+            'geojson and wkt': lambda: [GEOSGeometry(GEOSGeometry(json.dumps(g)).wkt)
+                                        for g in geometries],
+            'wkb': lambda: [GEOSGeometry(memoryview(geojson_to_wkb(g))) for g in geometries],
+        }
+
+    def bench_model_objects(self):
+        from djgeojson.serializers import Serializer
+
+        users = self.users()
+        objects = list(users)
+        properties = ['username', 'email', 'is_staff', 'date_joined']
+        return {
+            'queryset': lambda: Serializer().serialize(users.all(), properties=properties),
+            'values': lambda: Serializer().serialize(users.all(), properties=properties, values=True),
+            'all fields': lambda: Serializer().serialize(users.all()),
+            'extra properties': lambda: Serializer().serialize(
+                users.all(), properties=properties + ['is_authenticated']),
+            'list': lambda: Serializer().serialize(objects, properties=properties),
+        }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Run djgeojson benchmarks (all of them by default)."
+    )
+    parser.add_argument('names', nargs='*', type=str)
+    parser.add_argument('--number', type=int, default=5)
+    args = parser.parse_args()
+    QuickDjangoBenchmark(args.names, args.number)
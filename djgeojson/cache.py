@@ -0,0 +1,231 @@
+import gzip
+import hashlib
+import json
+import math
+
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+from django.utils.http import quote_etag
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+from . import GEOJSON_DEFAULT_SRID
+from .serializers import get_coord_transform
+
+MAX_LATITUDE = 85.0511287798066
+
+# Content encodings, by order of preference
+COMPRESSORS = {}
+if zstd is not None:
+    COMPRESSORS['zstd'] = lambda content: zstd.compress(content, 10)
+if brotli is not None:
+    COMPRESSORS['br'] = lambda content: brotli.compress(content, quality=9)
+COMPRESSORS['gzip'] = lambda content: gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def tile_index(lon, lat, zoom):
+    """
+    Returns the (x, y) of the tile containing the WGS84 point at ``zoom``.
+    http://wiki.openstreetmap.org/wiki/Slippy_map_tilenames#Lon..2Flat._to_tile_numbers_2
+    """
+    n = 2 ** zoom
+    lat_rad = math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, lat)))
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return (max(0, min(n - 1, x)), max(0, min(n - 1, y)))
+
+
+class TileCache(object):
+    """
+    Cache of serialized tiles, backed by the Django cache framework.
+
+    Tiles are stored by layer and (z, x, y), with one variant per set of
+    serializer options. They are evicted by extent with ``invalidate()``
+    (e.g. from model ``post_save`` and ``post_delete`` signals). At zoom
+    levels where the extent covers more than ``max_tiles`` tiles, all the
+    tiles of the layer are evicted at once. Tiles beyond ``max_zoom`` are
+    not cached.
+    """
+    key_prefix = 'djgeojson:tile'
+
+    def __init__(self, alias='default', timeout=3600, max_zoom=20, max_tiles=1000):
+        self.alias = alias
+        self.timeout = timeout
+        self.max_zoom = max_zoom
+        self.max_tiles = max_tiles
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _generation_key(self, layer, z):
+        return '%s:%s:%s:generation' % (self.key_prefix, layer, z)
+
+    def _tile_key(self, layer, generation, z, x, y):
+        return '%s:%s:%s:%s:%s:%s' % (self.key_prefix, layer, generation, z, x, y)
+
+    def _variant_key(self, options):
+        encoded = json.dumps(options, sort_keys=True, default=str)
+        return hashlib.md5(encoded.encode('utf-8')).hexdigest()
+
+    def get_key(self, layer, z, x, y):
+        generation = self.cache.get(self._generation_key(layer, z), 0)
+        return self._tile_key(layer, generation, z, x, y)
+
+    def get(self, layer, z, x, y, options):
+        """ Returns the cached tile content, or ``None`` """
+        if z > self.max_zoom:
+            return None
+        variants = self.cache.get(self.get_key(layer, z, x, y)) or {}
+        return variants.get(self._variant_key(options))
+
+    def set(self, layer, z, x, y, options, content):
+        """ Store the tile content (tiles beyond ``max_zoom`` are not cached) """
+        if z > self.max_zoom:
+            return
+        key = self.get_key(layer, z, x, y)
+        variants = self.cache.get(key) or {}
+        variants[self._variant_key(options)] = content
+        self.cache.set(key, variants, self.timeout)
+
+    def invalidate(self, layer, geometry):
+        """
+        Evict the tiles of the layer that intersect the extent of the
+        geometry (or of the ``(xmin, ymin, xmax, ymax)`` WGS84 extent).
+        """
+        if hasattr(geometry, 'extent'):
+            if geometry.srid and geometry.srid != GEOJSON_DEFAULT_SRID:
+                geometry = geometry.transform(
+                    get_coord_transform(geometry.srid, GEOJSON_DEFAULT_SRID), clone=True)
+            extent = geometry.extent
+        else:
+            extent = geometry
+        xmin, ymin, xmax, ymax = extent
+
+        for z in range(self.max_zoom + 1):
+            x0, y0 = tile_index(xmin, ymax, z)
+            x1, y1 = tile_index(xmax, ymin, z)
+            if (x1 - x0 + 1) * (y1 - y0 + 1) > self.max_tiles:
+                self.invalidate_zoom(layer, z)
+                continue
+            generation = self.cache.get(self._generation_key(layer, z), 0)
+            self.cache.delete_many([self._tile_key(layer, generation, z, x, y)
+                                    for x in range(x0, x1 + 1)
+                                    for y in range(y0, y1 + 1)])
+
+    def invalidate_zoom(self, layer, z):
+        """ Evict all the tiles of the layer at zoom level ``z`` """
+        key = self._generation_key(layer, z)
+        self.cache.add(key, 0, None)
+        self.cache.incr(key)
+
+    def invalidate_layer(self, layer):
+        for z in range(self.max_zoom + 1):
+            self.invalidate_zoom(layer, z)
+
+
+class LayerCache(object):
+    """
+    Cache of whole serialized layers, backed by the Django cache framework.
+
+    Layers are stored compressed in every available content encoding
+    (gzip, and brotli or zstd when installed), with their ETag, and are
+    served as is according to the ``Accept-Encoding`` of requests. There
+    is one variant per set of serializer options. They are evicted with
+    ``invalidate()``, e.g. on model signals (``connect()``).
+    """
+    key_prefix = 'djgeojson:layer'
+
+    def __init__(self, alias='default', timeout=3600, encodings=None):
+        self.alias = alias
+        self.timeout = timeout
+        self.encodings = [e for e in (encodings or COMPRESSORS) if e in COMPRESSORS]
+        if 'gzip' not in self.encodings:
+            # Decompressed for clients not accepting other encodings
+            self.encodings.append('gzip')
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _generation_key(self, layer):
+        return '%s:%s:generation' % (self.key_prefix, layer)
+
+    def get_key(self, layer, options):
+        generation = self.cache.get(self._generation_key(layer), 0)
+        encoded = json.dumps(options, sort_keys=True, default=str)
+        variant = hashlib.md5(encoded.encode('utf-8')).hexdigest()
+        return '%s:%s:%s:%s' % (self.key_prefix, layer, generation, variant)
+
+    def get(self, layer, options):
+        """ Returns the cached layer (dict of ``etag`` and encoded contents), or ``None`` """
+        return self.cache.get(self.get_key(layer, options))
+
+    def set(self, layer, options, content):
+        """ Compress and store the layer content, and returns the cached layer """
+        entry = {encoding: COMPRESSORS[encoding](content) for encoding in self.encodings}
+        entry['etag'] = quote_etag(hashlib.md5(content).hexdigest())
+        self.cache.set(self.get_key(layer, options), entry, self.timeout)
+        return entry
+
+    def get_encoding(self, accept_encoding):
+        """
+        Returns the content encoding of cached layers accepted by the
+        client (``None`` for identity).
+        """
+        accepted = set()
+        for part in accept_encoding.lower().replace(' ', '').split(','):
+            coding, _, quality = part.partition(';q=')
+            try:
+                if float(quality or 1) > 0:
+                    accepted.add(coding)
+            except ValueError:
+                continue
+        for encoding in self.encodings:
+            if encoding in accepted or '*' in accepted:
+                return encoding
+        return None
+
+    def negotiate(self, entry, accept_encoding):
+        """
+        Returns the content encoding of the cached layer accepted by the
+        client (``None`` for identity), and the content in this encoding.
+        """
+        encoding = self.get_encoding(accept_encoding)
+        if encoding is None:
+            return None, gzip.decompress(entry['gzip'])
+        return encoding, entry[encoding]
+
+    def get_etag(self, etag, encoding):
+        """
+        Returns the ETag of the representation in the content encoding
+        (``None`` for identity), since their bytes differ.
+        """
+        if encoding is None:
+            return etag
+        return '%s-%s"' % (etag[:-1], encoding)
+
+    def invalidate(self, layer):
+        """ Evict all the variants of the layer """
+        key = self._generation_key(layer)
+        self.cache.add(key, 0, None)
+        self.cache.incr(key)
+
+    def connect(self, model, layer):
+        """ Evict the layer when objects of the model are saved or deleted """
+        def invalidate(sender, **kwargs):
+            self.invalidate(layer)
+        uid = '%s:%s:%s' % (self.key_prefix, self.alias, layer)
+        post_save.connect(invalidate, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(invalidate, sender=model, weak=False, dispatch_uid=uid)
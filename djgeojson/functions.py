@@ -0,0 +1,62 @@
+"""
+    Geometry database functions not provided by ``django.contrib.gis``,
+    for PostGIS and SpatiaLite.
+"""
+from django.contrib.gis.db.models.functions import (
+    NUMERIC_TYPES,
+    GeoFunc,
+    GeomOutputGeoFunc,
+)
+from django.db.models import FloatField
+from django.db.models.functions import Greatest
+
+
+class Force2D(GeomOutputGeoFunc):
+    arity = 1
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super(Force2D, self).as_sql(compiler, connection,
+                                           function='CastToXY', **extra_context)
+
+
+class SimplifyPreserveTopology(GeomOutputGeoFunc):
+    def __init__(self, expression, tolerance, **extra):
+        expressions = [
+            expression,
+            self._handle_param(tolerance, 'tolerance', NUMERIC_TYPES),
+        ]
+        super(SimplifyPreserveTopology, self).__init__(*expressions, **extra)
+
+
+class BoundFunc(GeoFunc):
+    """ A coordinate of the bounding box of the geometry """
+    arity = 1
+    output_field = FloatField()
+    spatialite_function = None
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super(BoundFunc, self).as_sql(compiler, connection,
+                                             function=self.spatialite_function,
+                                             **extra_context)
+
+
+class XMin(BoundFunc):
+    spatialite_function = 'MbrMinX'
+
+
+class XMax(BoundFunc):
+    spatialite_function = 'MbrMaxX'
+
+
+class YMin(BoundFunc):
+    spatialite_function = 'MbrMinY'
+
+
+class YMax(BoundFunc):
+    spatialite_function = 'MbrMaxY'
+
+
+def bbox_size(expression):
+    """ Returns the size of the largest side of the bounding box of the geometry """
+    return Greatest(XMax(expression) - XMin(expression),
+                    YMax(expression) - YMin(expression))
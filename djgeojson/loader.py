@@ -0,0 +1,86 @@
+import logging
+import time
+from itertools import islice
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .serializers import Deserializer
+
+logger = logging.getLogger(__name__)
+
+
+class BulkLoader(object):
+    """
+    Load GeoJSON features into the database with ``bulk_create()``, by
+    chunks of features, each one in a transaction.
+
+    Features whose primary key already exists are skipped with
+    ``ignore_conflicts``, or updated with ``update_conflicts``. Model
+    signals (e.g. ``post_save``) are not sent.
+    """
+    def __init__(self, chunk_size=1000, using=DEFAULT_DB_ALIAS,
+                 ignore_conflicts=False, update_conflicts=False):
+        if ignore_conflicts and update_conflicts:
+            raise ValueError("ignore_conflicts and update_conflicts are mutually exclusive")
+        self.chunk_size = chunk_size
+        self.using = using
+        self.ignore_conflicts = ignore_conflicts
+        self.update_conflicts = update_conflicts
+        self.count = 0
+        self.duration = 0.0
+
+    @property
+    def throughput(self):
+        """ Features loaded per second by the last ``load()`` """
+        return self.count / self.duration if self.duration else 0.0
+
+    def load(self, stream_or_string, **options):
+        """
+        Load the features of a GeoJSON stream or string, with the options
+        of the deserializer (e.g. ``model_name``, ``geometry_field``).
+        Returns the number of features loaded.
+        """
+        objects = Deserializer(stream_or_string, using=self.using, **options)
+        start = time.perf_counter()
+        self.count, self.duration = 0, 0.0
+        while True:
+            chunk = [d.object for d in islice(objects, self.chunk_size)]
+            if not chunk:
+                break
+            with transaction.atomic(using=self.using):
+                self.save_objects(chunk)
+            self.count += len(chunk)
+            self.duration = time.perf_counter() - start
+            logger.info("Loaded %s features (%d features/s)", self.count, self.throughput)
+        return self.count
+
+    def save_objects(self, objects):
+        """ Insert (or update) a chunk of model instances, grouped by model """
+        by_model = {}
+        for obj in objects:
+            by_model.setdefault(type(obj), []).append(obj)
+        for model, instances in by_model.items():
+            if model._meta.parents:
+                # Multi-table inheritance is not supported by bulk_create()
+                for obj in instances:
+                    obj.save(using=self.using)
+            elif self.update_conflicts:
+                self._upsert(model, instances)
+            else:
+                model._base_manager.using(self.using).bulk_create(
+                    instances, ignore_conflicts=self.ignore_conflicts)
+
+    def _upsert(self, model, instances):
+        pk = model._meta.pk
+        fields = [f.name for f in model._meta.concrete_fields if not f.primary_key]
+        manager = model._base_manager.using(self.using)
+        features = connections[self.using].features
+        if features.supports_update_conflicts:
+            unique_fields = [pk.name] if features.supports_update_conflicts_with_target else None
+            manager.bulk_create(instances, update_conflicts=True,
+                                unique_fields=unique_fields, update_fields=fields)
+            return
+        existing = set(manager.filter(pk__in=[o.pk for o in instances if o.pk is not None])
+                       .values_list('pk', flat=True))
+        manager.bulk_create([o for o in instances if o.pk not in existing])
+        manager.bulk_update([o for o in instances if o.pk in existing], fields)
@@ -0,0 +1,49 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from ...loader import BulkLoader
+
+
+class Command(BaseCommand):
+    help = "Load GeoJSON features (FeatureCollection or GeoJSONSeq) with bulk inserts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="GeoJSON file, or '-' to read the standard input.")
+        parser.add_argument('--model', dest='model_name',
+                            help="Model of the features (e.g. 'app.model'), "
+                                 "instead of their 'model' property.")
+        parser.add_argument('--geometry-field', default='geom',
+                            help="Model field of the geometries (default: 'geom').")
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help="Number of features inserted per transaction (default: 1000).")
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS,
+                            help="Database to load the features into.")
+        conflicts = parser.add_mutually_exclusive_group()
+        conflicts.add_argument('--ignore-conflicts', action='store_true',
+                               help="Skip the features whose primary key already exists.")
+        conflicts.add_argument('--update-conflicts', action='store_true',
+                               help="Update the features whose primary key already exists.")
+
+    def handle(self, path, **options):
+        loader = BulkLoader(chunk_size=options['chunk_size'],
+                            using=options['database'],
+                            ignore_conflicts=options['ignore_conflicts'],
+                            update_conflicts=options['update_conflicts'])
+        deserializer_options = {'geometry_field': options['geometry_field']}
+        if options['model_name']:
+            deserializer_options['model_name'] = options['model_name']
+
+        if path == '-':
+            loader.load(sys.stdin.buffer, **deserializer_options)
+        else:
+            try:
+                stream = open(path, 'rb')
+            except OSError as e:
+                raise CommandError("Cannot open %s: %s" % (path, e))
+            with stream:
+                loader.load(stream, **deserializer_options)
+
+        self.stdout.write("Loaded %s features in %.1f s (%d features/s)" % (
+            loader.count, loader.duration, loader.throughput))
@@ -0,0 +1,276 @@
+"""
+    Mapbox Vector Tiles encoding, following the specification 2.1:
+    https://github.com/mapbox/vector-tile-spec/tree/master/2.1
+
+    Tiles are encoded by PostGIS (``ST_AsMVT()``) when possible, or by
+    the pure-Python encoder of this module.
+"""
+import json
+import struct
+from io import BytesIO
+
+from django.db import connections
+from django.db.models import F, IntegerField
+
+from .serializers import DjangoGeoJSONEncoder
+from .serializers import Serializer as GeoJSONSerializer
+from .serializers import geometry_to_geojson
+
+MVT_SRID = 3857
+MVT_EXTENT = 4096
+MVT_ORIGIN = 20037508.342789244
+
+POINT, LINESTRING, POLYGON = 1, 2, 3
+GEOMETRY_TYPES = {
+    'Point': POINT,
+    'MultiPoint': POINT,
+    'LineString': LINESTRING,
+    'MultiLineString': LINESTRING,
+    'Polygon': POLYGON,
+    'MultiPolygon': POLYGON,
+}
+MOVE_TO, LINE_TO, CLOSE_PATH = 1, 2, 7
+
+
+def tile_bounds(z, x, y):
+    """ Returns the extent of the tile in Web Mercator """
+    size = 2 * MVT_ORIGIN / 2 ** z
+    return (-MVT_ORIGIN + x * size, MVT_ORIGIN - (y + 1) * size,
+            -MVT_ORIGIN + (x + 1) * size, MVT_ORIGIN - y * size)
+
+
+def _varint(value):
+    encoded = bytearray()
+    while value > 0x7f:
+        encoded.append(value & 0x7f | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _zigzag(value):
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _key(number, wire_type):
+    return _varint(number << 3 | wire_type)
+
+
+def _message(number, data):
+    return _key(number, 2) + _varint(len(data)) + data
+
+
+def _packed(number, values):
+    return _message(number, b''.join(_varint(v) for v in values))
+
+
+def _ring_area(points):
+    """ Twice the signed area, positive for clockwise rings (y axis down) """
+    return sum(x1 * y2 - x2 * y1
+               for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]))
+
+
+def encode_geometry(geometry, bounds, extent=MVT_EXTENT):
+    """
+    Returns the type and the commands of a GeoJSON geometry (dict), scaled
+    from ``bounds`` to the tile grid, or ``(None, [])`` if nothing remains.
+    """
+    geom_type = GEOMETRY_TYPES.get(geometry['type'])
+    if geom_type is None:
+        return None, []
+    xmin, ymin, xmax, ymax = bounds
+    xscale, yscale = extent / (xmax - xmin), extent / (ymax - ymin)
+
+    def scale(coordinates):
+        points = []
+        for coords in coordinates:
+            point = (int(round((coords[0] - xmin) * xscale)),
+                     int(round((ymax - coords[1]) * yscale)))
+            if not points or point != points[-1]:
+                points.append(point)
+        return points
+
+    commands = []
+    cursor = [0, 0]
+
+    def draw(command, points):
+        commands.append(command & 0x7 | len(points) << 3)
+        for x, y in points:
+            commands.append(_zigzag(x - cursor[0]))
+            commands.append(_zigzag(y - cursor[1]))
+            cursor[:] = x, y
+
+    parts = geometry['coordinates']
+    if geometry['type'] in ('Point', 'LineString', 'Polygon'):
+        parts = [parts]
+
+    if geom_type == POINT:
+        points = [scale([coords])[0] for coords in parts if coords]
+        if points:
+            draw(MOVE_TO, points)
+    elif geom_type == LINESTRING:
+        for line in parts:
+            points = scale(line)
+            if len(points) > 1:
+                draw(MOVE_TO, points[:1])
+                draw(LINE_TO, points[1:])
+    else:
+        for polygon in parts:
+            for i, ring in enumerate(polygon):
+                points = scale(ring)
+                if len(points) > 1 and points[0] == points[-1]:
+                    points.pop()
+                area = _ring_area(points)
+                if area == 0:
+                    if i == 0:
+                        # Exterior ring collapsed, drop its holes too
+                        break
+                    continue
+                # Exterior rings are clockwise, interior rings counter-clockwise
+                if (area > 0) != (i == 0):
+                    points[1:] = points[:0:-1]
+                draw(MOVE_TO, points[:1])
+                draw(LINE_TO, points[1:])
+                commands.append(CLOSE_PATH | 1 << 3)
+
+    if not commands:
+        return None, []
+    return geom_type, commands
+
+
+def _property_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    # Same representation as in GeoJSON (dates, decimals, ...)
+    value = json.loads(DjangoGeoJSONEncoder().encode(value))
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return json.dumps(value)
+
+
+def _encode_value(value):
+    if isinstance(value, bool):
+        return _key(7, 0) + _varint(int(value))
+    if isinstance(value, int):
+        if value >= 0:
+            return _key(5, 0) + _varint(value)
+        return _key(6, 0) + _varint(_zigzag(value))
+    if isinstance(value, float):
+        return _key(3, 1) + struct.pack('<d', value)
+    return _message(1, value.encode('utf-8'))
+
+
+def encode_layer(name, features, bounds, extent=MVT_EXTENT):
+    """
+    Returns a tile with one layer of GeoJSON features (dicts), whose
+    geometries are dicts or GEOS geometries in the projection of ``bounds``.
+    """
+    keys, values = {}, {}
+    encoded = []
+    for feature in features:
+        geometry = feature.get('geometry')
+        if geometry is None:
+            continue
+        if not isinstance(geometry, dict):
+            geometry = geometry_to_geojson(geometry)
+        geom_type, commands = encode_geometry(geometry, bounds, extent)
+        if geom_type is None:
+            continue
+
+        tags = []
+        for key, value in feature.get('properties', {}).items():
+            value = _property_value(value)
+            if value is not None:
+                tags.append(keys.setdefault(key, len(keys)))
+                tags.append(values.setdefault((type(value), value), len(values)))
+
+        data = b''
+        feature_id = feature.get('id')
+        if isinstance(feature_id, int) and not isinstance(feature_id, bool) and feature_id >= 0:
+            data += _key(1, 0) + _varint(feature_id)
+        if tags:
+            data += _packed(2, tags)
+        data += _key(3, 0) + _varint(geom_type) + _packed(4, commands)
+        encoded.append(_message(2, data))
+
+    layer = [_key(15, 0) + _varint(2), _message(1, name.encode('utf-8'))]
+    layer.extend(encoded)
+    layer.extend(_message(3, key.encode('utf-8')) for key in keys)
+    layer.extend(_message(4, _encode_value(value)) for _, value in values)
+    layer.append(_key(5, 0) + _varint(extent))
+    return _message(3, b''.join(layer))
+
+
+class Serializer(GeoJSONSerializer):
+    """
+    Serialize a queryset as a vector tile with a single layer. Features
+    are built as in GeoJSON, and ``database_collection`` encodes the
+    whole tile with PostGIS.
+    """
+    serializer_options = GeoJSONSerializer.serializer_options + (
+        'layer_name', 'tile_bounds', 'extent', 'buffer')
+
+    def _setup(self, options):
+        options.setdefault('stream', BytesIO())
+        options['srid'] = MVT_SRID
+        options['crs'] = False
+        options['streaming'] = False
+        options['database_geojson'] = False
+        super(Serializer, self)._setup(options)
+        self.layer_name = options.get('layer_name', 'default')
+        self.tile_bounds = options['tile_bounds']
+        self.extent = options.get('extent', MVT_EXTENT)
+        self.buffer = options.get('buffer', 64)
+
+    def end_serialization(self):
+        self.reproject_features()
+        self.stream.write(encode_layer(self.layer_name,
+                                       self.feature_collection['features'],
+                                       self.tile_bounds, self.extent))
+
+    def _database_feature_id(self, queryset):
+        if callable(self.primary_key):
+            return None
+        field = queryset.model._meta.pk
+        if self.primary_key:
+            field = queryset.model._meta.get_field(self.primary_key)
+        if isinstance(field, IntegerField):
+            return F(field.attname)
+        return None
+
+    def get_database_collection(self, queryset):
+        """
+        Returns the tile encoded by PostGIS (``ST_AsMVT()``), or ``None``
+        if the database or the options are not supported.
+        """
+        connection = connections[queryset.db]
+        if not getattr(connection.ops, 'postgis', False):
+            return None
+        geometry = self.get_database_geometry(queryset)
+        properties = self._database_properties(queryset)
+        if geometry is None or properties is None:
+            return None
+
+        columns = {'djgeojson_geometry': geometry}
+        select = ['ST_AsMVTGeom(t.djgeojson_geometry, ST_MakeEnvelope(%s, %s, %s, %s, %s), %s, %s, true) AS djgeojson_geometry']
+        params = list(self.tile_bounds) + [MVT_SRID, self.extent, self.buffer]
+        feature_id = self._database_feature_id(queryset)
+        if feature_id is not None:
+            columns['djgeojson_id'] = feature_id
+            select.append('t.djgeojson_id')
+        for i, (name, value) in enumerate(properties):
+            if isinstance(value, F):
+                columns['djgeojson_%s' % i] = value
+                select.append('t.djgeojson_%s AS %s' % (i, connection.ops.quote_name(name)))
+            else:
+                select.append('%%s::text AS %s' % connection.ops.quote_name(name))
+                params.append(value)
+
+        queryset_sql, queryset_params = queryset.values(**columns).query.get_compiler(
+            queryset.db).as_sql()
+        sql = "SELECT ST_AsMVT(mvt, %%s, %%s, 'djgeojson_geometry'%s) FROM (SELECT %s FROM (%s) AS t) AS mvt" % (
+            ", 'djgeojson_id'" if feature_id is not None else '', ', '.join(select), queryset_sql)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.layer_name, self.extent] + params + list(queryset_params))
+            tile = cursor.fetchone()[0]
+        return bytes(tile) if tile is not None else b''
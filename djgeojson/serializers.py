@@ -5,21 +5,36 @@
 
     Itself, adapted from @jeffkistler's geojson serializer at: https://gist.github.com/967274
 """
+import codecs
+import ctypes
 import json
 import logging
+import re
+import struct
+import threading
+import warnings
+from collections import namedtuple
 from contextlib import contextmanager
+from functools import lru_cache
 from io import StringIO  # NOQA
+from itertools import chain, repeat
 
 import django
 from django.db.models.base import Model
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 try:
     from django.db.models.query import QuerySet, ValuesQuerySet
+    ModelIterable = None
 except ImportError:
-    from django.db.models.query import QuerySet
+    from django.db.models.query import ModelIterable, QuerySet
     ValuesQuerySet = None
 
-from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
 from django.core.serializers.base import (
     DeserializationError,
     SerializationError,
@@ -27,13 +42,18 @@ from django.core.serializers.base import (
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.serializers.python import Deserializer as PythonDeserializer
 from django.core.serializers.python import Serializer as PythonSerializer
-from django.forms.models import model_to_dict
+from django.db import connections
+from django.db.models import F, prefetch_related_objects
 from django.utils.encoding import smart_str
 
 try:
     from django.contrib.gis.db.models.fields import GeometryField
+    from django.contrib.gis.db.models.functions import AsGeoJSON, Transform
     from django.contrib.gis.geos import GEOSGeometry, WKBWriter
+
+    from .functions import Force2D, SimplifyPreserveTopology
 except (ImportError, ImproperlyConfigured):
+    AsGeoJSON = None
     from .nogeos import WKBWriter
     from .nogeos import GEOSGeometry
     from .fields import GeometryField
@@ -41,6 +61,15 @@ except (ImportError, ImproperlyConfigured):
 from . import GEOJSON_DEFAULT_SRID
 from .fields import GeoJSONField
 
+try:
+    from django.contrib.gis.gdal import CoordTransform, SpatialReference
+    from django.contrib.gis.gdal.libgdal import std_call
+    _oct_transform = std_call('OCTTransform')
+    _oct_transform.restype = ctypes.c_int
+    _oct_transform.argtypes = [ctypes.c_void_p, ctypes.c_int] + [ctypes.POINTER(ctypes.c_double)] * 3
+except (ImportError, ImproperlyConfigured):
+    CoordTransform = None
+
 if django.VERSION >= (5, 2):
     get_model = PythonDeserializer._get_model_from_node
 else:
@@ -48,11 +77,31 @@ else:
 
 logger = logging.getLogger(__name__)
 
+SERIALIZATION_PLANS_MAX = 256
+
+""" Lines and rings with fewer points are not read with NumPy """
+NUMPY_MIN_POINTS = 16
+
+""" Handlers of the properties fields, extra properties, and relations to fetch """
+SerializationPlan = namedtuple('SerializationPlan', ['handlers', 'extras',
+                                                     'select_related', 'prefetch_related'])
+
+_serialization_plans = {}
+
 
 def hasattr_lazy(obj, name):
+    """
+    Returns whether the object has the attribute, without evaluating it
+    (e.g. properties). Class attributes are listed once per class.
+    """
     if isinstance(obj, dict):
         return name in obj
-    return name in dir(obj)
+    return name in getattr(obj, '__dict__', ()) or name in _class_attributes(type(obj))
+
+
+@lru_cache(maxsize=256)
+def _class_attributes(cls):
+    return frozenset(dir(cls))
 
 
 def get_field_remote_field(field):
@@ -63,11 +112,284 @@ def get_field_remote_field(field):
         return field.remote_field
 
 
+WKB_GEOMETRY_TYPES = {
+    1: 'Point',
+    2: 'LineString',
+    3: 'Polygon',
+    4: 'MultiPoint',
+    5: 'MultiLineString',
+    6: 'MultiPolygon',
+    7: 'GeometryCollection',
+}
+
+
+def round_coordinates(coordinates, precision):
+    """
+    Round a NumPy array of coordinates like ``round()``. ``numpy.round()``
+    scales values by a power of ten, which is inexact: values close to a
+    half are thus rounded by Python.
+    """
+    rounded = numpy.round(coordinates, precision)
+    scaled = numpy.abs(coordinates * 10.0 ** precision)
+    inexact = (numpy.abs(scaled % 1 - 0.5) <= scaled * 1e-15) | (scaled >= 2 ** 52)
+    if inexact.any():
+        rounded[inexact] = [round(c, precision) for c in coordinates[inexact].tolist()]
+    return rounded
+
+
+def _read_wkb(wkb, offset, precision=None):
+    """
+    Read the geometry at ``offset`` of the (E)WKB buffer, and return it as a
+    GeoJSON geometry dict, along with the offset of the next geometry.
+    Coordinates are rounded to ``precision`` decimals if specified.
+    """
+    byteorder = '<' if wkb[offset] == 1 else '>'
+    code, = struct.unpack_from(byteorder + 'I', wkb, offset + 1)
+    offset += 5
+    if code & 0x20000000:
+        # EWKB SRID
+        offset += 4
+    # EWKB or ISO WKB Z flag
+    code, hasz = code & 0xffff, code & 0x80000000
+    dims = 3 if hasz or 1000 <= code < 2000 else 2
+    geom_type = WKB_GEOMETRY_TYPES[code % 1000]
+
+    def read_points(offset):
+        count, = struct.unpack_from(byteorder + 'I', wkb, offset)
+        offset += 4
+        if numpy is not None and count >= NUMPY_MIN_POINTS:
+            coordinates = numpy.frombuffer(wkb, byteorder + 'f8', count * dims, offset)
+            if precision is not None:
+                coordinates = round_coordinates(coordinates, precision)
+            return coordinates.reshape(count, dims).tolist(), offset + 8 * count * dims
+        flat = struct.unpack_from('%s%sd' % (byteorder, count * dims), wkb, offset)
+        if precision is not None:
+            flat = map(round, flat, repeat(precision))
+        return list(zip(*[iter(flat)] * dims)), offset + 8 * count * dims
+
+    if geom_type == 'Point':
+        coordinates = list(struct.unpack_from('%s%sd' % (byteorder, dims), wkb, offset))
+        if precision is not None:
+            coordinates = [round(c, precision) for c in coordinates]
+        offset += 8 * dims
+        return {"type": geom_type, "coordinates": coordinates}, offset
+
+    if geom_type == 'LineString':
+        coordinates, offset = read_points(offset)
+        return {"type": geom_type, "coordinates": coordinates}, offset
+
+    if geom_type == 'Polygon':
+        count, = struct.unpack_from(byteorder + 'I', wkb, offset)
+        offset += 4
+        coordinates = []
+        for i in range(count):
+            ring, offset = read_points(offset)
+            coordinates.append(ring)
+        return {"type": geom_type, "coordinates": coordinates}, offset
+
+    count, = struct.unpack_from(byteorder + 'I', wkb, offset)
+    offset += 4
+    members = []
+    for i in range(count):
+        member, offset = _read_wkb(wkb, offset, precision)
+        members.append(member)
+    if geom_type == 'GeometryCollection':
+        return {"type": geom_type, "geometries": members}, offset
+    return {"type": geom_type, "coordinates": [m["coordinates"] for m in members]}, offset
+
+
+def geometry_to_geojson(geometry, precision=None):
+    """
+    Returns the GeoJSON geometry dict of a GEOS geometry.
+
+    Coordinates are read straight from the WKB buffer, instead of
+    parsing the GeoJSON text built by GDAL, with NumPy if it is installed.
+    """
+    try:
+        wkb = geometry.wkb
+    except (AttributeError, ValueError):
+        # No GEOS, or empty point (not representable in WKB)
+        return round_floats(json.loads(geometry.geojson), precision)
+    return _read_wkb(memoryview(wkb), 0, precision)[0]
+
+
+_coord_transforms = threading.local()
+
+
+def get_coord_transform(source_srid, target_srid):
+    """
+    Returns the ``CoordTransform`` between two SRIDs. It is built once per
+    thread, since GDAL transformations cannot be shared between threads.
+    """
+    transforms = getattr(_coord_transforms, 'transforms', None)
+    if transforms is None:
+        transforms = _coord_transforms.transforms = {}
+    transform = transforms.get((source_srid, target_srid))
+    if transform is None:
+        transform = CoordTransform(SpatialReference(source_srid), SpatialReference(target_srid))
+        transforms[(source_srid, target_srid)] = transform
+    return transform
+
+
+GEOJSON_DEPTHS = {
+    'Point': 0,
+    'MultiPoint': 1,
+    'LineString': 1,
+    'Polygon': 2,
+    'MultiLineString': 2,
+    'MultiPolygon': 3,
+}
+
+
+def _map_positions(geometry, func):
+    """ Returns the geometry dict, with ``func()`` of every position """
+    if geometry['type'] == 'GeometryCollection':
+        return {"type": geometry['type'],
+                "geometries": [_map_positions(g, func) for g in geometry['geometries']]}
+
+    def walk(coordinates, depth):
+        if depth == 0:
+            return func(coordinates) if coordinates else coordinates
+        return [walk(c, depth - 1) for c in coordinates]
+    return {"type": geometry['type'],
+            "coordinates": walk(geometry['coordinates'], GEOJSON_DEPTHS[geometry['type']])}
+
+
+def transform_geometries(geometries, srid, precision=None):
+    """
+    Returns the GeoJSON geometry dicts of GEOS geometries (with the same
+    SRID) reprojected to ``srid``, with a single GDAL call for all their
+    coordinates.
+    """
+    geometries = list(geometries)
+    if not geometries:
+        return []
+    transform = get_coord_transform(geometries[0].srid, srid)
+    geometries = [geometry_to_geojson(g) for g in geometries]
+
+    positions = []
+    for geometry in geometries:
+        _map_positions(geometry, positions.append)
+    count = len(positions)
+    xs = (ctypes.c_double * count)(*[p[0] for p in positions])
+    ys = (ctypes.c_double * count)(*[p[1] for p in positions])
+    zs = (ctypes.c_double * count)(*[p[2] if len(p) > 2 else 0 for p in positions])
+    if count and not _oct_transform(transform.ptr, count, xs, ys, zs):
+        raise SerializationError('Could not transform geometries to SRID %s' % srid)
+
+    if precision is not None:
+        xs, ys, zs = ([round(c, precision) for c in cs] for cs in (xs, ys, zs))
+    transformed = iter(range(count))
+
+    def reproject(position):
+        i = next(transformed)
+        return (xs[i], ys[i], zs[i]) if len(position) > 2 else (xs[i], ys[i])
+    return [_map_positions(g, reproject) for g in geometries]
+
+
+WKB_GEOMETRY_CODES = {name: code for code, name in WKB_GEOMETRY_TYPES.items()}
+
+
+def _geojson_dims(geometry):
+    """ Returns the dimension of the first position of a GeoJSON geometry dict """
+    if geometry['type'] == 'GeometryCollection':
+        return max([_geojson_dims(g) for g in geometry['geometries']] or [2])
+    coordinates = geometry['coordinates']
+    for i in range(GEOJSON_DEPTHS[geometry['type']]):
+        if not coordinates:
+            return 2
+        coordinates = coordinates[0]
+    return 3 if len(coordinates) > 2 else 2
+
+
+def _write_wkb(geometry, dims, chunks):
+    code = WKB_GEOMETRY_CODES[geometry['type']]
+    chunks.append(struct.pack('<BI', 1, code | 0x80000000 if dims == 3 else code))
+
+    def write_points(positions, count=True):
+        flat = list(chain.from_iterable(positions))
+        if len(flat) != len(positions) * dims:
+            flat = [c for p in positions for c in (list(p) + [0.0] * dims)[:dims]]
+        if count:
+            chunks.append(struct.pack('<I', len(positions)))
+        chunks.append(struct.pack('<%sd' % len(flat), *flat))
+
+    if geometry['type'] == 'GeometryCollection':
+        members = geometry['geometries']
+    else:
+        coordinates = geometry['coordinates']
+        if geometry['type'] == 'Point':
+            # Empty points are written with NaN coordinates
+            write_points([coordinates or [float('nan')] * dims], count=False)
+            return
+        if geometry['type'] == 'LineString':
+            write_points(coordinates)
+            return
+        if geometry['type'] == 'Polygon':
+            chunks.append(struct.pack('<I', len(coordinates)))
+            for ring in coordinates:
+                write_points(ring)
+            return
+        member_type = geometry['type'][len('Multi'):]
+        members = [{'type': member_type, 'coordinates': c} for c in coordinates]
+
+    chunks.append(struct.pack('<I', len(members)))
+    for member in members:
+        _write_wkb(member, dims, chunks)
+
+
+def geojson_to_wkb(geometry):
+    """
+    Returns the (E)WKB of a GeoJSON geometry dict, from which GEOS
+    geometries are built without parsing JSON or WKT text.
+    """
+    chunks = []
+    _write_wkb(geometry, _geojson_dims(geometry), chunks)
+    return b''.join(chunks)
+
+
+class GeoJSONText(object):
+    """
+    GeoJSON geometry text (e.g. built by the database), that is inserted as is
+    in the serializer output.
+    """
+    def __init__(self, text):
+        self.text = text
+
+
+def round_floats(value, precision):
+    """
+    Round the floats of JSON values (nested in lists, tuples or dicts).
+    """
+    if precision is None:
+        return value
+    if isinstance(value, float):
+        return round(value, precision)
+    if isinstance(value, (list, tuple)):
+        return [round_floats(v, precision) for v in value]
+    if isinstance(value, dict):
+        return {k: round_floats(v, precision) for k, v in value.items()}
+    return value
+
+
 class DjangoGeoJSONEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder for GEOS geometries.
+
+    With ``precision``, geometries coordinates are rounded when they are
+    converted, so that the C encoder can still be used (see ``round_floats()``
+    for other values).
+    """
+    def __init__(self, *args, **kwargs):
+        self.precision = kwargs.pop('precision', None)
+        super(DjangoGeoJSONEncoder, self).__init__(*args, **kwargs)
 
     def default(self, o):
         if isinstance(o, GEOSGeometry):
-            return json.loads(o.geojson)
+            return geometry_to_geojson(o, self.precision)
+        elif isinstance(o, GeoJSONText):
+            # When it could not be inserted as is
+            return json.loads(o.text)
         else:
             return super(DjangoGeoJSONEncoder, self).default(o)
 
@@ -76,7 +398,14 @@ class DjangoGeoJSONEncoder(DjangoJSONEncoder):
 def json_encoder_with_precision(precision, JSONEncoderClass):
     """
     Context manager to set float precision during json encoding
+
+    Deprecated: rounding floats is slow with the pure-Python encoder, and the
+    global ``FLOAT_REPR`` is not thread-safe. Use ``DjangoGeoJSONEncoder(precision=...)``
+    and ``round_floats()`` instead.
     """
+    warnings.warn("'json_encoder_with_precision' is deprecated, use "
+                  "'DjangoGeoJSONEncoder(precision=...)' instead",
+                  DeprecationWarning)
     needs_class_hack = not hasattr(json.encoder, 'FLOAT_REPR')
     try:
         if precision is not None:
@@ -159,6 +488,16 @@ class Serializer(PythonSerializer):
 
     internal_use_only = False
 
+    """ Options consumed by the serializer, the others are given to the JSON encoder """
+    serializer_options = ('stream', 'properties', 'primary_key', 'geometry_field',
+                          'use_natural_keys', 'crs', 'crs_type', 'srid', 'force2d',
+                          'simplify', 'bbox', 'bbox_auto', 'with_modelname',
+                          'precision', 'streaming', 'chunk_size', 'database_geojson',
+                          'database_collection', 'values', 'links')
+
+    """ Name of the annotation with the GeoJSON built by the database """
+    database_geojson_annotation = 'djgeojson_geometry'
+
     def start_serialization(self):
         self.feature_collection = {"type": "FeatureCollection", "features": []}
         if self.crs is not False:
@@ -166,10 +505,17 @@ class Serializer(PythonSerializer):
 
         bbox = self.options.pop('bbox', None)
         if bbox:
-            self.feature_collection["bbox"] = bbox
+            self.feature_collection["bbox"] = round_floats(bbox, self.precision)
+
+        links = self.options.get('links')
+        if links:
+            self.feature_collection["links"] = links
 
         self._current = None
 
+        if self.streaming:
+            self._start_stream()
+
     def get_crs(self):
         crs = {}
         crs_type = self.options.pop('crs_type', None)
@@ -206,15 +552,16 @@ class Serializer(PythonSerializer):
         if primary_key:
             self._current['id'] = primary_key
 
-    def end_object(self, obj):
+    def end_object(self, obj, extras=None):
         # Add extra properties from dynamic attributes
-        extras = []
-        if isinstance(self.properties, dict):
-            extras = [field for field, name in self.properties.items()
-                      if name not in self._current['properties']]
-        elif isinstance(self.properties, (list, tuple)):
-            extras = [field for field in self.properties
-                      if field not in self._current['properties']]
+        if extras is None:
+            extras = []
+            if isinstance(self.properties, dict):
+                extras = [field for field, name in self.properties.items()
+                          if name not in self._current['properties']]
+            elif isinstance(self.properties, (list, tuple)):
+                extras = [field for field in self.properties
+                          if field not in self._current['properties']]
 
         for field in extras:
             if hasattr_lazy(obj, field):
@@ -233,28 +580,138 @@ class Serializer(PythonSerializer):
             else:
                 logger.warn("No GeometryField found in object")
 
-        self.feature_collection["features"].append(self._current)
-        self._current = None
+        self._end_feature()
+
+    def _end_feature(self):
+        # Optional float precision control (geometries are rounded by encoder)
+        if self.precision is not None:
+            self._current = round_floats(self._current, self.precision)
+
+        feature, self._current = self._current, None
+        geometry = feature.get('geometry')
+        if isinstance(geometry, GEOSGeometry) and geometry.srid and geometry.srid != self.srid:
+            self._to_reproject.append(feature)
+
+        if self.streaming:
+            self._chunk.append(feature)
+            if len(self._chunk) >= self.chunk_size:
+                self._write_chunk()
+        else:
+            self.feature_collection["features"].append(feature)
+            if len(self._to_reproject) >= self.chunk_size:
+                self.reproject_features()
+
+    def reproject_features(self):
+        """
+        Reproject the geometries of the features ended since the last call,
+        by batches of geometries with the same SRID.
+        """
+        by_srid = {}
+        for feature in self._to_reproject:
+            by_srid.setdefault(feature['geometry'].srid, []).append(feature)
+        for features in by_srid.values():
+            geometries = transform_geometries([f['geometry'] for f in features],
+                                              self.srid, self.precision)
+            for feature, geometry in zip(features, geometries):
+                feature['geometry'] = geometry
+        self._to_reproject = []
+
+    def _write_chunk(self):
+        self.reproject_features()
+        for feature in self._chunk:
+            self._write_feature(feature)
+        self._chunk = []
 
     def end_serialization(self):
-        self.options.pop('stream', None)
-        self.options.pop('properties', None)
-        self.options.pop('primary_key', None)
-        self.options.pop('geometry_field', None)
-        self.options.pop('use_natural_keys', None)
-        self.options.pop('crs', None)
-        self.options.pop('srid', None)
-        self.options.pop('force2d', None)
-        self.options.pop('simplify', None)
-        self.options.pop('bbox', None)
-        self.options.pop('bbox_auto', None)
-        self.options.pop('with_modelname', None)
-
-        # Optional float precision control
-        precision = self.options.pop('precision', None)
-
-        with json_encoder_with_precision(precision, DjangoGeoJSONEncoder) as cls:
-            json.dump(self.feature_collection, self.stream, cls=cls, **self.options)
+        if self.streaming:
+            self._write_chunk()
+            self._end_stream()
+            return
+
+        self.reproject_features()
+
+        encoder = self.get_json_encoder()
+        if encoder.indent is not None:
+            self.stream.write(encoder.encode(self.feature_collection))
+            return
+
+        self._start_stream()
+        for feature in self.feature_collection["features"]:
+            self._write_feature(feature)
+        self._end_stream()
+
+    def get_json_options(self):
+        """ Options that are passed through to the JSON encoder """
+        return {k: v for k, v in self.options.items()
+                if k not in self.serializer_options}
+
+    def get_json_encoder(self):
+        """
+        Returns a JSON encoder for this serialization. ``encode()`` is used
+        rather than ``json.dump()``, since it benefits from the C encoder.
+        """
+        return DjangoGeoJSONEncoder(precision=self.precision,
+                                    **self.get_json_options())
+
+    def _collection_keys(self):
+        keys = list(self.feature_collection.keys())
+        if self._encoder.sort_keys:
+            keys.sort()
+        index = keys.index('features')
+        return keys[:index], keys[index + 1:]
+
+    def _write_members(self, keys, first):
+        for key in keys:
+            if not first:
+                self.stream.write(self._encoder.item_separator)
+            first = False
+            self.stream.write(self._encoder.encode(key))
+            self.stream.write(self._encoder.key_separator)
+            self.stream.write(self._encoder.encode(self.feature_collection[key]))
+
+    def _start_stream(self):
+        """
+        Write the collection members that precede the features, and open the
+        features array. Output is identical to the one of ``encode()``.
+        """
+        self._encoder = self.get_json_encoder()
+        head, _ = self._collection_keys()
+        self.stream.write('{')
+        self._write_members(head, first=True)
+        if head:
+            self.stream.write(self._encoder.item_separator)
+        self.stream.write(self._encoder.encode('features'))
+        self.stream.write(self._encoder.key_separator)
+        self.stream.write('[')
+        self._features_count = 0
+
+    def _write_feature(self, feature):
+        if self._features_count:
+            self.stream.write(self._encoder.item_separator)
+        self.stream.write(self.encode_feature(feature))
+        self._features_count += 1
+
+    def encode_feature(self, feature):
+        geometry = feature.get('geometry')
+        if not isinstance(geometry, GeoJSONText) or self._encoder.sort_keys or \
+                next(reversed(feature)) != 'geometry':
+            return self._encoder.encode(feature)
+        # Insert the geometry text as is, instead of decoding it
+        del feature['geometry']
+        encoded = self._encoder.encode(feature)
+        feature['geometry'] = geometry
+        return '%s%s"geometry"%s%s}' % (encoded[:-1], self._encoder.item_separator,
+                                        self._encoder.key_separator, geometry.text)
+
+    def _end_stream(self):
+        """
+        Close the features array, and write the remaining collection members,
+        which can thus be computed while features are written.
+        """
+        self.stream.write(']')
+        _, tail = self._collection_keys()
+        self._write_members(tail, first=False)
+        self.stream.write('}')
 
     def _handle_geom(self, value):
         """ Geometry processing (in place), depending on options """
@@ -286,11 +743,11 @@ class Serializer(PythonSerializer):
             simplify = self.options.get('simplify')
             if simplify is not None:
                 geometry = geometry.simplify(tolerance=simplify, preserve_topology=True)
-            # Optional geometry reprojection
-            if geometry.srid and geometry.srid != self.srid:
-                geometry.transform(self.srid)
-            # Optional bbox
+            # Optional bbox (geometries are otherwise reprojected by chunks)
             if self.options.get('bbox_auto'):
+                if geometry.srid and geometry.srid != self.srid:
+                    geometry = geometry.transform(get_coord_transform(geometry.srid, self.srid),
+                                                  clone=True)
                 self._current['bbox'] = geometry.extent
 
         self._current['geometry'] = geometry
@@ -322,18 +779,25 @@ class Serializer(PythonSerializer):
         if callable(getattr(self.stream, 'getvalue', None)):
             return self.stream.getvalue()
 
+    def handle_property(self, obj, field_name, name):
+        self._current['properties'][name] = getattr(obj, field_name)
+
+    def _overrides_handle_field(self):
+        """ Returns whether a subclass serializes fields with its own ``handle_field()`` """
+        return type(self).handle_field is not Serializer.handle_field
+
+    def handle_value_field(self, obj, field_name, attname):
+        """ Handle the field of a model object like in its values (``model_to_dict()``) """
+        self.handle_field({field_name: getattr(obj, attname)}, field_name)
+
     def handle_fk_field(self, obj, field):
+        if not (self.use_natural_keys and hasattr(get_field_remote_field(field).model, 'natural_key')):
+            # The column holds the value of the related field, no need to fetch the object
+            self._current['properties'][field.name] = smart_str(getattr(obj, field.attname), strings_only=True)
+            return
         related = getattr(obj, field.name)
         if related is not None:
-            if self.use_natural_keys and hasattr(related, 'natural_key'):
-                related = related.natural_key()
-            else:
-                if get_field_remote_field(field).field_name == related._meta.pk.name:
-                    # Related to remote object via primary key
-                    related = related._get_pk_val()
-                else:
-                    # Related to remote object via other field
-                    related = smart_str(getattr(related, get_field_remote_field(field).field_name), strings_only=True)
+            related = related.natural_key()
         self._current['properties'][field.name] = related
 
     def handle_m2m_field(self, obj, field):
@@ -349,8 +813,10 @@ class Serializer(PythonSerializer):
             else:
                 def m2m_value(value):
                     return smart_str(value._get_pk_val(), strings_only=True)
+            # Unsaved objects have no relations yet
+            related_objects = getattr(obj, field.name).all() if obj.pk is not None else []
             self._current['properties'][field.name] = [m2m_value(related)
-                                                       for related in getattr(obj, field.name).iterator()]
+                                                       for related in related_objects]
 
     def handle_reverse_field(self, obj, field, field_name):
         if self.use_natural_keys and hasattr(field.model, 'natural_key'):
@@ -359,95 +825,364 @@ class Serializer(PythonSerializer):
         else:
             def reverse_value(value):
                 return smart_str(value._get_pk_val(), strings_only=True)
-        values = [reverse_value(related) for related in getattr(obj, field_name).iterator()]
+        values = [reverse_value(related) for related in getattr(obj, field_name).all()]
         self._current['properties'][field_name] = values
 
-    def serialize_object_list(self, objects):
-        if len(objects) == 0:
-            return
+    def _prepare_object_list(self, objects):
+        """
+        Returns the function serializing the objects of the list, and fetch
+        the many-to-many relations of model objects in bulk.
+        """
+        self._plans = {}
+        if len(objects) == 0 or isinstance(objects[0], dict):
+            return self.serialize_values_object
 
-        # Transform to list of dicts instead of objects
-        if not isinstance(objects[0], dict):
-            values = []
-            for obj in objects:
-                objdict = model_to_dict(obj)
-                # In case geometry is not a DB field
-                if self.geometry_field not in objdict:
-                    objdict[self.geometry_field] = getattr(obj, self.geometry_field)
-                if self.properties:
-                    extras = [f for f in self.properties if hasattr(obj, f)]
-                    for field_name in extras:
-                        objdict[field_name] = getattr(obj, field_name)
-                values.append(objdict)
-            objects = values
-
-        self.serialize_values_queryset(objects)
+        model = type(objects[0])
+        plan = self.get_serialization_plan(model, values=True)
+        if plan.prefetch_related:
+            saved = [obj for obj in objects if type(obj) is model and obj.pk is not None]
+            prefetch_related_objects(saved, *plan.prefetch_related)
+        return self.serialize_list_object
+
+    def serialize_object_list(self, objects):
+        serialize_object = self._prepare_object_list(objects)
+        for obj in objects:
+            serialize_object(obj)
 
     def serialize_values_queryset(self, queryset):
         for obj in queryset:
-            self.start_object(obj)
+            self.serialize_values_object(obj)
 
-            # handle the geometry field
-            self.handle_field(obj, self.geometry_field)
+    def serialize_values_object(self, obj):
+        self.start_object(obj)
 
-            for field_name in obj:
-                if field_name not in obj:
-                    continue
-                if self.properties is None or field_name in self.properties:
-                    self.handle_field(obj, field_name)
+        # handle the geometry field
+        self.handle_field(obj, self.geometry_field)
 
-            self.end_object(obj)
+        for field_name in obj:
+            if field_name not in obj:
+                continue
+            if self.properties is None or field_name in self.properties:
+                self.handle_field(obj, field_name)
 
-    def serialize_queryset(self, queryset):
-        opts = queryset.model._meta
-        local_fields = opts.local_fields
-        many_to_many_fields = opts.many_to_many
-        reversed_fields = [obj.field for obj in get_all_related_objects(opts)]
-        reversed_fields += [obj.field for obj in get_all_related_many_to_many_objects(opts)]
+        self.end_object(obj)
 
-        # populate each queryset obj as a feature
-        for obj in queryset:
-            self.start_object(obj)
+    def serialize_list_object(self, obj):
+        """
+        Serialize a model object of a list like its values: editable fields,
+        without the model name, nor the primary key as id.
+        """
+        plan = self._plans.get(type(obj))
+        if plan is None:
+            plan = self._plans[type(obj)] = self.get_serialization_plan(type(obj), values=True)
+
+        self.start_object(obj)
+        if not self.primary_key:
+            self._current.pop('id', None)
+        self.handle_field(obj, self.geometry_field)
+        for handler, args in plan.handlers:
+            handler(self, obj, *args)
+        for field in plan.extras:
+            if hasattr_lazy(obj, field):
+                self.handle_field(obj, field)
+        self._end_feature()
 
-            # handle the geometry field
-            self.handle_field(obj, self.geometry_field)
+    def get_database_geometry(self, queryset):
+        """
+        Returns the expression of the geometry processed by the database,
+        according to the options, or ``None`` if the geometry is not a
+        database geometry field.
+        """
+        if AsGeoJSON is None:
+            return None
+        if self.geometry_field not in queryset.query.annotations:
+            try:
+                field = queryset.model._meta.get_field(self.geometry_field)
+            except FieldDoesNotExist:
+                # Dynamic attribute
+                return None
+            if not isinstance(field, GeometryField) or isinstance(field, GeoJSONField):
+                return None
+
+        geometry = F(self.geometry_field)
+        if self.options.get('force2d'):
+            geometry = Force2D(geometry)
+        simplify = self.options.get('simplify')
+        if simplify is not None:
+            geometry = SimplifyPreserveTopology(geometry, simplify)
+        return Transform(geometry, self.srid)
+
+    def _supports_database_geometry(self, queryset):
+        """ Returns whether the database processes geometries (PostGIS or SpatiaLite) """
+        ops = connections[queryset.db].ops
+        return getattr(ops, 'postgis', False) or getattr(ops, 'spatialite', False)
+
+    def _needs_database_processing(self, queryset):
+        """
+        Returns whether the geometries have to be processed (force 2D,
+        simplification, reprojection), and can be by the database.
+        """
+        if not self._supports_database_geometry(queryset):
+            return False
+        if self.get_database_geometry(queryset) is None:
+            return False
+        if self.geometry_field in (self.properties or ()) or self._overrides_handle_field():
+            # Also serialized (and processed) as a property, or by handle_field()
+            return False
+        if self.options.get('force2d') or self.options.get('simplify') is not None:
+            return True
+        if self.geometry_field in queryset.query.annotations:
+            field = queryset.query.annotations[self.geometry_field].output_field
+        else:
+            field = queryset.model._meta.get_field(self.geometry_field)
+        return getattr(field, 'srid', None) != self.srid
+
+    def _prepare_queryset(self, queryset):
+        self._database_geojson = False
+        self._database_geometry = False
+        if (self.options.get('database_geojson') and not self.bbox_auto and
+                not self._overrides_handle_field() and
+                self._supports_database_geometry(queryset)):
+            geometry = self.get_database_geometry(queryset)
+            if geometry is not None:
+                self._database_geojson = True
+                queryset = queryset.annotate(**{
+                    self.database_geojson_annotation: AsGeoJSON(geometry, precision=self.precision)
+                })
+                if self.geometry_field not in queryset.query.annotations:
+                    queryset = queryset.defer(self.geometry_field)
+
+        if not self._database_geojson and self._needs_database_processing(queryset):
+            # Python has no processing left on geometries
+            self._database_geometry = True
+            queryset = queryset.annotate(**{
+                self.database_geojson_annotation: self.get_database_geometry(queryset)
+            })
+            if self.geometry_field not in queryset.query.annotations:
+                queryset = queryset.defer(self.geometry_field)
+
+        self._values_columns = None
+        if self.options.get('values'):
+            columns = self._get_values_columns(queryset)
+            if columns is not None:
+                queryset = queryset.values_list(*columns)
+                if self.streaming:
+                    queryset = queryset.iterator(chunk_size=self.chunk_size)
+                return queryset
+
+        self._plan = self.get_serialization_plan(queryset.model)
+        if self._plan.select_related:
+            queryset = queryset.select_related(*self._plan.select_related)
+        if self._plan.prefetch_related:
+            queryset = queryset.prefetch_related(*self._plan.prefetch_related)
+
+        if self.streaming:
+            # Do not fill the queryset cache with every object
+            queryset = queryset.iterator(chunk_size=self.chunk_size)
+        return queryset
+
+    def _get_values_columns(self, queryset):
+        """
+        Returns the columns of the primary key, the geometry and the
+        properties, or ``None`` if some of them are not columns (see
+        ``_database_properties()``).
+        """
+        def is_column(name):
+            if name in queryset.query.annotations:
+                return True
+            if name == 'pk':
+                return True
+            try:
+                return queryset.model._meta.get_field(name).concrete
+            except FieldDoesNotExist:
+                return False
+
+        if callable(self.primary_key) or not is_column(self.primary_key or 'pk'):
+            return None
+        if self._overrides_handle_field():
+            return None
+        if self._database_geojson or self._database_geometry:
+            geometry = self.database_geojson_annotation
+        elif is_column(self.geometry_field):
+            geometry = self.geometry_field
+        else:
+            return None
+        properties = self._database_properties(queryset)
+        if properties is None:
+            return None
+
+        self._values_columns = [name for name, value in properties if isinstance(value, F)]
+        self._values_constants = [(name, value) for name, value in properties
+                                  if not isinstance(value, F)]
+        return [self.primary_key or 'pk', geometry] + [
+            value.name for name, value in properties if isinstance(value, F)]
+
+    def get_serialization_plan(self, model, values=False):
+        """
+        Returns the plan to serialize the objects of the model, computed
+        once per model and options. With ``values``, objects are serialized
+        like their values (objects of lists).
+        """
+        properties = self.properties
+        if isinstance(properties, dict):
+            properties = tuple(properties.items())
+        elif properties is not None:
+            properties = tuple(properties)
+        key = (type(self), model, values, type(self.properties), properties,
+               self.geometry_field, bool(self.use_natural_keys))
+        plan = _serialization_plans.get(key)
+        if plan is None:
+            if len(_serialization_plans) >= SERIALIZATION_PLANS_MAX:
+                _serialization_plans.clear()
+            if values:
+                plan = self._build_values_plan(model)
+            else:
+                plan = self._build_serialization_plan(model)
+            _serialization_plans[key] = plan
+        return plan
+
+    def _build_serialization_plan(self, model):
+        opts = model._meta
+        properties = self.properties
+        serializer_class = type(self)
+        custom_handle_field = self._overrides_handle_field()
+        handlers, names = [], []
+        select_related, prefetch_related = [], []
+
+        for field in opts.local_fields:
+            # don't include the pk in the properties
+            # as it is in the id of the feature
+            # except if explicitly listed in properties
+            if field.name == opts.pk.name and \
+                    (properties is None or 'id' not in properties):
+                continue
+            # ignore other geometries, and the geometry (already handled)
+            if isinstance(field, GeometryField) or field.name == self.geometry_field:
+                continue
+            if not (field.serialize or field.primary_key):
+                continue
 
-            # handle the property fields
-            for field in local_fields:
-                # don't include the pk in the properties
-                # as it is in the id of the feature
-                # except if explicitly listed in properties
-                if field.name == opts.pk.name and \
-                        (self.properties is None or 'id' not in self.properties):
-                    continue
-                # ignore other geometries
-                if isinstance(field, GeometryField):
-                    continue
-
-                if field.serialize or field.primary_key:
-                    if get_field_remote_field(field) is None:
-                        if self.properties is None or field.attname in self.properties:
-                            self.handle_field(obj, field.name)
+            remote_field = get_field_remote_field(field)
+            if remote_field is None:
+                if properties is None or field.attname in properties:
+                    name = properties[field.name] if isinstance(properties, dict) else field.name
+                    if custom_handle_field:
+                        handlers.append((serializer_class.handle_field, (field.name,)))
                     else:
-                        if self.properties is None or field.attname[:-3] in self.properties:
-                            self.handle_fk_field(obj, field)
+                        handlers.append((serializer_class.handle_property, (field.name, name)))
+                    names.append(name)
+            elif properties is None or field.attname[:-3] in properties:
+                handlers.append((serializer_class.handle_fk_field, (field,)))
+                names.append(field.name)
+                if self.use_natural_keys and hasattr(remote_field.model, 'natural_key'):
+                    select_related.append(field.name)
+
+        for field in opts.many_to_many:
+            if field.serialize and (properties is None or field.attname in properties):
+                handlers.append((serializer_class.handle_m2m_field, (field,)))
+                if get_field_remote_field(field).through._meta.auto_created:
+                    names.append(field.name)
+                    prefetch_related.append(field.name)
 
-            for field in many_to_many_fields:
-                if field.serialize:
-                    if self.properties is None or field.attname in self.properties:
-                        self.handle_m2m_field(obj, field)
+        reversed_fields = [obj.field for obj in get_all_related_objects(opts)]
+        reversed_fields += [obj.field for obj in get_all_related_many_to_many_objects(opts)]
+        for field in reversed_fields:
+            if field.serialize:
+                field_name = get_field_remote_field(field).related_name or opts.object_name.lower()
+                if properties is None or field_name in properties:
+                    handlers.append((serializer_class.handle_reverse_field, (field, field_name)))
+                    names.append(field_name)
+                    if hasattr(model, field_name):
+                        prefetch_related.append(field_name)
+
+        # Extra properties from dynamic attributes
+        if isinstance(properties, dict):
+            extras = [field for field, name in properties.items() if name not in names]
+        elif isinstance(properties, (list, tuple)):
+            extras = [field for field in properties if field not in names]
+        else:
+            extras = []
+
+        return SerializationPlan(tuple(handlers), tuple(extras),
+                                 tuple(select_related), tuple(prefetch_related))
+
+    def _build_values_plan(self, model):
+        opts = model._meta
+        properties = self.properties
+        serializer_class = type(self)
+        custom_handle_field = self._overrides_handle_field()
+        handlers, names, prefetch_related = [], [], []
+
+        # Fields of model_to_dict()
+        for field in chain(opts.concrete_fields, opts.private_fields, opts.many_to_many):
+            if not getattr(field, 'editable', False) or field.name == self.geometry_field:
+                continue
+            if properties is not None and field.name not in properties:
+                continue
+            names.append(field.name)
+            if field.many_to_many:
+                handlers.append((serializer_class.handle_m2m_field, (field,)))
+                if get_field_remote_field(field).through._meta.auto_created:
+                    prefetch_related.append(field.name)
+            elif custom_handle_field:
+                handlers.append((serializer_class.handle_value_field, (field.name, field.attname)))
+            else:
+                name = properties[field.name] if isinstance(properties, dict) else field.name
+                handlers.append((serializer_class.handle_property, (field.attname, name)))
 
-            for field in reversed_fields:
-                if field.serialize:
-                    field_name = get_field_remote_field(field).related_name or opts.object_name.lower()
-                    if self.properties is None or field_name in self.properties:
-                        self.handle_reverse_field(obj, field, field_name)
-            self.end_object(obj)
+        extras = [field for field in properties or []
+                  if field not in names and field != self.geometry_field]
+        return SerializationPlan(tuple(handlers), tuple(extras), (), tuple(prefetch_related))
 
-    def serialize(self, queryset, **options):
+    def serialize_queryset(self, queryset):
+        # populate each queryset obj as a feature
+        objects = self._prepare_queryset(queryset)
+        serialize_object = self.serialize_model_object
+        if self._values_columns is not None:
+            serialize_object = self.serialize_values_row
+        for obj in objects:
+            serialize_object(obj)
+
+    def serialize_values_row(self, row):
         """
-        Serialize a queryset.
+        Serialize a row of ``values_list()``: the primary key, the geometry
+        and the properties.
         """
+        properties = dict(zip(self._values_columns, row[2:]))
+        properties.update(self._values_constants)
+        self._current = {"type": "Feature", "properties": properties}
+        if row[0]:
+            self._current['id'] = row[0]
+        if self._database_geojson or self._database_geometry:
+            self._handle_database_geom(row[1])
+        else:
+            self._handle_geom(row[1])
+        self._end_feature()
+
+    def _handle_database_geom(self, value):
+        """ Geometry (or GeoJSON text) processed by the database """
+        if self._database_geojson:
+            self._current['geometry'] = GeoJSONText(value) if value else None
+            return
+        if value is not None and self.options.get('bbox_auto'):
+            self._current['bbox'] = value.extent
+        self._current['geometry'] = value
+
+    def serialize_model_object(self, obj):
+        self.start_object(obj)
+
+        # handle the geometry field
+        if self._database_geojson or self._database_geometry:
+            self._handle_database_geom(getattr(obj, self.database_geojson_annotation))
+        else:
+            self.handle_field(obj, self.geometry_field)
+
+        # handle the property fields
+        for handler, args in self._plan.handlers:
+            handler(self, obj, *args)
+        self.end_object(obj, extras=self._plan.extras)
+
+    def _setup(self, options):
         self.options = options
 
         self.stream = options.get("stream", StringIO())
@@ -460,10 +1195,161 @@ class Serializer(PythonSerializer):
         self.srid = options.get("srid", GEOJSON_DEFAULT_SRID)
         self.crs = options.get("crs", True)
         self.crs_type = options.get("crs_type", 'name')
+        self.precision = options.get("precision")
+        # Features are written one by one (not supported with indentation)
+        self.streaming = options.get("streaming", False) and options.get("indent") is None
+        self.chunk_size = options.get("chunk_size", 2000)
+        self._database_geojson = False
+        self._database_geometry = False
+        # Features waiting for their geometry to be reprojected, or to be written
+        self._to_reproject = []
+        self._chunk = []
+
+    def _database_properties(self, queryset):
+        """
+        Returns the list of (property name, expression) serialized by
+        ``serialize_model_object()``, or ``None`` if some of them cannot be
+        obtained with SQL (relations, natural keys, dynamic attributes).
+        """
+        opts = queryset.model._meta
+        properties = []
+        for field in opts.local_fields:
+            if field.name == opts.pk.name and \
+                    (self.properties is None or 'id' not in self.properties):
+                continue
+            if isinstance(field, GeometryField) or not (field.serialize or field.primary_key):
+                continue
+            if get_field_remote_field(field) is None:
+                if self.properties is None or field.attname in self.properties:
+                    name = field.name
+                    if isinstance(self.properties, dict):
+                        name = self.properties[field.attname]
+                    properties.append((name, F(field.attname)))
+            elif self.properties is None or field.attname[:-3] in self.properties:
+                if self.use_natural_keys:
+                    return None
+                # The column holds the value of the related field
+                properties.append((field.name, F(field.attname)))
+
+        for field in opts.many_to_many:
+            if field.serialize and (self.properties is None or field.attname in self.properties):
+                return None
+        for relation in opts.related_objects:
+            field_name = get_field_remote_field(relation.field).related_name or opts.object_name.lower()
+            if relation.field.serialize and (self.properties is None or field_name in self.properties):
+                return None
+
+        # Extra properties from annotations
+        if isinstance(self.properties, dict):
+            extras = self.properties.items()
+        else:
+            extras = [(field, field) for field in self.properties or []]
+        serialized = [name for name, expression in properties]
+        for field_name, name in extras:
+            if name in serialized or field_name == self.geometry_field:
+                continue
+            if field_name in queryset.query.annotations:
+                properties.append((name, F(field_name)))
+            elif field_name in queryset.query.extra_select or hasattr(queryset.model, field_name):
+                return None
+
+        if self.options.get('with_modelname', True):
+            properties.append(('model', smart_str(opts)))
+        return properties
+
+    def get_database_collection(self, queryset):
+        """
+        Returns the whole FeatureCollection, built by a single PostGIS query,
+        or ``None`` if the database or the options are not supported.
+        """
+        connection = connections[queryset.db]
+        if AsGeoJSON is None or not getattr(connection.ops, 'postgis', False):
+            return None
+        if callable(self.primary_key):
+            return None
+        geometry = self.get_database_geometry(queryset)
+        properties = self._database_properties(queryset)
+        if geometry is None or properties is None:
+            return None
+
+        columns = {
+            'djgeojson_geometry': geometry,
+            'djgeojson_id': F(self.primary_key or 'pk'),
+        }
+        properties_sql, params = [], []
+        for i, (name, value) in enumerate(properties):
+            if isinstance(value, F):
+                columns['djgeojson_%s' % i] = value
+                properties_sql.append('%%s::text, t.djgeojson_%s' % i)
+                params.append(name)
+            else:
+                properties_sql.append('%s::text, %s::text')
+                params.extend([name, value])
+
+        feature_sql = [
+            "'type', 'Feature'",
+            "'properties', json_build_object(%s)" % ', '.join(properties_sql),
+            "'id', t.djgeojson_id",
+        ]
+        if self.bbox_auto:
+            extent = ['%s(t.djgeojson_geometry)' % f
+                      for f in ('ST_XMin', 'ST_YMin', 'ST_XMax', 'ST_YMax')]
+            if self.precision is not None:
+                extent = ['round(%s::numeric, %s)' % (e, int(self.precision)) for e in extent]
+            feature_sql.append("'bbox', json_build_array(%s)" % ', '.join(extent))
+        if self.precision is None:
+            feature_sql.append("'geometry', ST_AsGeoJSON(t.djgeojson_geometry)::json")
+        else:
+            feature_sql.append("'geometry', ST_AsGeoJSON(t.djgeojson_geometry, %s)::json"
+                               % int(self.precision))
+
+        collection_sql = [
+            "'type', 'FeatureCollection'",
+            "'features', COALESCE(json_agg(json_build_object(%s)), '[]'::json)" % ', '.join(feature_sql),
+        ]
+        if self.crs is not False:
+            collection_sql.append("'crs', %s::json")
+            params.append(json.dumps(self.get_crs()))
+        bbox = self.options.get('bbox')
+        if bbox:
+            collection_sql.append("'bbox', %s::json")
+            params.append(json.dumps(round_floats(bbox, self.precision)))
+        links = self.options.get('links')
+        if links:
+            collection_sql.append("'links', %s::json")
+            params.append(json.dumps(links))
+
+        # Features are aggregated in the order of the queryset
+        queryset_sql, queryset_params = queryset.values(**columns).query.get_compiler(
+            queryset.db).as_sql()
+        sql = 'SELECT json_build_object(%s)::text FROM (%s) AS t' % (
+            ', '.join(collection_sql), queryset_sql)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + list(queryset_params))
+            return cursor.fetchone()[0]
+
+    def _is_values_queryset(self, queryset):
+        """ Returns whether the queryset yields values (e.g. ``values()``) instead of model objects """
+        if ValuesQuerySet is not None:
+            return isinstance(queryset, ValuesQuerySet)
+        return isinstance(queryset, QuerySet) and not issubclass(queryset._iterable_class, ModelIterable)
+
+    def serialize(self, queryset, **options):
+        """
+        Serialize a queryset.
+        """
+        self._setup(options)
+
+        if self.options.get('database_collection') and isinstance(queryset, QuerySet) and \
+                not self._is_values_queryset(queryset):
+            collection = self.get_database_collection(queryset)
+            if collection is not None:
+                self.stream.write(collection)
+                return self.getvalue()
 
         self.start_serialization()
 
-        if ValuesQuerySet is not None and isinstance(queryset, ValuesQuerySet):
+        if self._is_values_queryset(queryset):
             self.serialize_values_queryset(queryset)
 
         elif isinstance(queryset, list):
@@ -475,34 +1361,201 @@ class Serializer(PythonSerializer):
         self.end_serialization()
         return self.getvalue()
 
+    def iterserialize(self, queryset, **options):
+        """
+        Serialize a queryset in streaming mode, and yield the output
+        every ``chunk_size`` features.
+        """
+        options['stream'] = StringIO()
+        options['streaming'] = True
+        options.pop('indent', None)
+        self._setup(options)
+
+        def flush():
+            value = self.stream.getvalue()
+            self.stream.seek(0)
+            self.stream.truncate()
+            return value
+
+        if self.options.get('database_collection') and isinstance(queryset, QuerySet) and \
+                not self._is_values_queryset(queryset):
+            collection = self.get_database_collection(queryset)
+            if collection is not None:
+                yield collection
+                return
+
+        self.start_serialization()
+        yield flush()
+
+        if self._is_values_queryset(queryset):
+            objects, serialize_object = queryset, self.serialize_values_object
+
+        elif isinstance(queryset, list):
+            objects, serialize_object = queryset, self._prepare_object_list(queryset)
+
+        elif isinstance(queryset, QuerySet):
+            objects, serialize_object = self._prepare_queryset(queryset), self.serialize_model_object
+            if self._values_columns is not None:
+                serialize_object = self.serialize_values_row
+
+        else:
+            objects, serialize_object = [], None
+
+        for i, obj in enumerate(objects, 1):
+            serialize_object(obj)
+            if i % self.chunk_size == 0:
+                yield flush()
+
+        self.end_serialization()
+        yield flush()
+
+
+class JSONReader(object):
+    """
+    Incremental reader of JSON values from a file-like object, reading it by
+    chunks and keeping only the value being decoded in memory.
+    """
+    whitespace = re.compile(r'[ \t\n\r\x1e]*')
+
+    def __init__(self, stream, chunk_size=65536):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+        self.bytes_decoder = codecs.getincrementaldecoder('utf-8-sig')()
+
+    def read(self, size):
+        data = self.stream.read(size)
+        self.eof = not data
+        if isinstance(data, bytes):
+            data = self.bytes_decoder.decode(data, final=self.eof)
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+
+    def peek(self):
+        """ Returns the next character after whitespace, or '' at the end """
+        while True:
+            self.pos = self.whitespace.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self.read(self.chunk_size)
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError('Expecting %r at %r' % (char, self.buffer[self.pos:self.pos + 20]))
+        self.pos += 1
+
+    def malformed(self, error):
+        """
+        Returns whether the decoding error is not due to the end of the
+        buffer, i.e. the value is malformed whatever follows.
+        """
+        if error.msg.startswith('Unterminated string'):
+            return False
+        # Truncated literal (e.g. -Infinity) or escape (e.g. surrogate pair)
+        return error.pos < len(self.buffer) - 16
+
+    def value(self):
+        size = self.chunk_size
+        while True:
+            self.peek()
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof or self.malformed(e):
+                    raise
+                end = None
+            # A value at the end of the buffer (e.g. a number) may be truncated
+            if end is not None and (end < len(self.buffer) or self.eof):
+                self.pos = end
+                return value
+            self.read(size)
+            size *= 2
+
+    def members(self):
+        """ Yield the keys of an object, whose values have to be read """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            if self.peek() != ',':
+                self.expect('}')
+                return
+            self.pos += 1
+
+    def items(self):
+        """ Yield the items of an array """
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() != ',':
+                self.expect(']')
+                return
+            self.pos += 1
+
+
+def iter_features(stream, chunk_size=65536):
+    """
+    Yield the features of a GeoJSON file-like object, one at a time: the
+    features of a FeatureCollection, or a sequence of features (GeoJSONSeq,
+    or newline-delimited GeoJSON).
+    """
+    reader = JSONReader(stream, chunk_size)
+    while reader.peek():
+        members = {}
+        for key in reader.members():
+            if key == 'features':
+                for feature in reader.items():
+                    yield feature
+            else:
+                members[key] = reader.value()
+        if members.get('type') == 'Feature':
+            yield members
+        elif members.get('type') != 'FeatureCollection':
+            raise ValueError('Expecting a Feature or a FeatureCollection')
+
 
 def Deserializer(stream_or_string, **options):
     """
-    Deserialize a stream or string of JSON data.
+    Deserialize a stream or string of JSON data: a FeatureCollection, or a
+    sequence of features (GeoJSONSeq). Features are read one at a time.
     """
 
     geometry_field = options.get("geometry_field", "geom")
+    # Fields names, and whether the geometry is a GeoJSONField, by model name
+    models = {}
 
     def FeatureToPython(dictobj):
         properties = dictobj['properties']
         model_name = options.get("model_name") or properties.pop('model')
+        try:
+            field_names, geojson_field = models[model_name]
+        except KeyError:
+            model = get_model(model_name)
+            field_names = frozenset(f.name for f in model._meta.fields)
+            geojson_field = isinstance(model._meta.get_field(geometry_field), GeoJSONField)
+            models[model_name] = field_names, geojson_field
         # Deserialize concrete fields only (bypass dynamic properties)
-        model = get_model(model_name)
-        field_names = [f.name for f in model._meta.fields]
-        fields = {}
-        for k, v in properties.items():
-            if k in field_names:
-                fields[k] = v
+        fields = {k: v for k, v in properties.items() if k in field_names}
         obj = {
             "model": model_name,
             "pk": dictobj.get('id') or properties.get('id'),
             "fields": fields
         }
-        if isinstance(model._meta.get_field(geometry_field), GeoJSONField):
+        if geojson_field or dictobj['geometry'] is None:
             obj['fields'][geometry_field] = dictobj['geometry']
         else:
-            shape = GEOSGeometry(json.dumps(dictobj['geometry']))
-            obj['fields'][geometry_field] = shape.wkt
+            # Parsed by GEOS when the geometry field is accessed
+            obj['fields'][geometry_field] = memoryview(geojson_to_wkb(dictobj['geometry']))
         return obj
 
     if isinstance(stream_or_string, str):
@@ -510,8 +1563,7 @@ def Deserializer(stream_or_string, **options):
     else:
         stream = stream_or_string
     try:
-        collection = json.load(stream)
-        objects = [FeatureToPython(f) for f in collection['features']]
+        objects = (FeatureToPython(f) for f in iter_features(stream))
         for obj in PythonDeserializer(objects, **options):
             yield obj
     except GeneratorExit:
@@ -1,19 +1,54 @@
+import datetime
+import gzip
+import io
 import json
+import tempfile
+import threading
+from unittest import mock, skipUnless
 
 import django
 from django.conf import settings
 from django.contrib.gis.db import models
-from django.contrib.gis.geos import GeometryCollection, LineString, Point
+from django.contrib.gis.geos import (
+    GeometryCollection,
+    GEOSGeometry,
+    LineString,
+    Point,
+    Polygon,
+)
 from django.core import serializers
+from django.core.cache import caches
 from django.core.exceptions import SuspiciousOperation, ValidationError
+from django.core.management import call_command
+from django.core.serializers.base import DeserializationError
+from django.db import connection
 from django.forms import HiddenInput
-from django.test import TestCase
+from django.http import QueryDict
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.encoding import smart_str
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .cache import LayerCache, TileCache, tile_index
 from .fields import GeoJSONField, GeoJSONFormField, GeoJSONValidator
-from .serializers import Serializer
+from .loader import BulkLoader
+from .mvt import encode_geometry, encode_layer
+from .serializers import (
+    Serializer,
+    geojson_to_wkb,
+    geometry_to_geojson,
+    get_coord_transform,
+    get_model,
+    hasattr_lazy,
+    iter_features,
+    transform_geometries,
+)
 from .templatetags.geojson_tags import geojsonfeature
-from .views import GeoJSONLayerView, TiledGeoJSONLayerView
+from .views import GeoJSONLayerView, TiledGeoJSONLayerView, TiledMVTLayerView
 
 settings.SERIALIZATION_MODULES = {'geojson': 'djgeojson.serializers'}
 
@@ -128,6 +163,94 @@ class GeoJsonDeSerializerTest(TestCase):
 
         self.assertEqual(my_object.name, "bleh")
 
+    def test_features_are_read_one_at_a_time(self):
+        features = [{"type": "Feature", "id": i, "properties": {"name": "é%s" % i},
+                     "geometry": {"type": "Point", "coordinates": [i, 1.5]}}
+                    for i in range(10)]
+        collection = json.dumps({"type": "FeatureCollection", "features": features,
+                                 "crs": {"type": "name"}})
+        stream = io.BytesIO(collection.encode('utf-8'))
+        reader = iter_features(stream, chunk_size=16)
+        self.assertEqual(next(reader), features[0])
+        self.assertLess(stream.tell(), len(collection) / 2)
+        self.assertEqual(list(reader), features[1:])
+
+    def test_malformed_features_are_not_read_until_the_end(self):
+        features = [{"type": "Feature", "id": i, "properties": {},
+                     "geometry": {"type": "Point", "coordinates": [i, 1.5]}}
+                    for i in range(100)]
+        collection = json.dumps({"type": "FeatureCollection", "features": features})
+        collection = collection.replace('"id": 1,', '"id": 1', 1)
+        stream = io.BytesIO(collection.encode('utf-8'))
+        reader = iter_features(stream, chunk_size=64)
+        self.assertEqual(next(reader), features[0])
+        with self.assertRaises(ValueError):
+            next(reader)
+        self.assertLess(stream.tell(), len(collection) / 2)
+
+    def test_geojson_seq(self):
+        features = [{"type": "Feature", "id": i, "properties": {"model": "djgeojson.route", "name": "r%s" % i},
+                     "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, i]]}}
+                    for i in range(1, 4)]
+        for separator in ['\n', '\n\x1e']:
+            input_geojson = separator.join(json.dumps(f) for f in features)
+            objects = list(serializers.deserialize('geojson', io.StringIO(input_geojson)))
+            self.assertEqual([o.object.name for o in objects], ['r1', 'r2', 'r3'])
+
+    def test_models_are_resolved_once(self):
+        features = [{"type": "Feature", "properties": {"model": "djgeojson.route", "name": "r%s" % i},
+                     "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, i]]}}
+                    for i in range(3)]
+        input_geojson = json.dumps({"type": "FeatureCollection", "features": features})
+        with mock.patch('djgeojson.serializers.get_model', wraps=get_model) as resolve:
+            objects = list(serializers.deserialize('geojson', input_geojson))
+        self.assertEqual([o.object.name for o in objects], ['r0', 'r1', 'r2'])
+        self.assertEqual(resolve.call_count, 1)
+
+    def test_invalid_json(self):
+        with self.assertRaises(DeserializationError):
+            list(serializers.deserialize('geojson', '{"type": "FeatureCollection", "features": [{}'))
+
+
+class BulkLoaderTest(TestCase):
+
+    def geojson(self, names):
+        return json.dumps({"type": "FeatureCollection", "features": [
+            {"type": "Feature", "id": i + 1, "properties": {"name": name},
+             "geometry": {"type": "LineString", "coordinates": [[0, 0], [1, i]]}}
+            for i, name in enumerate(names)]})
+
+    def test_features_are_inserted_by_chunks(self):
+        loader = BulkLoader(chunk_size=2)
+        with CaptureQueriesContext(connection) as queries:
+            count = loader.load(self.geojson(['r1', 'r2', 'r3']), model_name='djgeojson.route')
+        self.assertEqual(count, 3)
+        self.assertEqual(loader.count, 3)
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('INSERT')]), 2)
+        self.assertEqual(list(Route.objects.order_by('pk').values_list('name', flat=True)),
+                         ['r1', 'r2', 'r3'])
+        self.assertEqual(Route.objects.get(pk=3).geom, LineString((0, 0), (1, 2), srid=4326))
+
+    def test_conflicts(self):
+        BulkLoader().load(self.geojson(['r1', 'r2']), model_name='djgeojson.route')
+        BulkLoader(ignore_conflicts=True).load(self.geojson(['a', 'b', 'c']),
+                                               model_name='djgeojson.route')
+        self.assertEqual(list(Route.objects.order_by('pk').values_list('name', flat=True)),
+                         ['r1', 'r2', 'c'])
+        BulkLoader(update_conflicts=True).load(self.geojson(['a', 'b']),
+                                               model_name='djgeojson.route')
+        self.assertEqual(list(Route.objects.order_by('pk').values_list('name', flat=True)),
+                         ['a', 'b', 'c'])
+
+    def test_management_command(self):
+        stdout = io.StringIO()
+        with tempfile.NamedTemporaryFile('w', suffix='.geojson') as f:
+            f.write(self.geojson(['r1', 'r2']))
+            f.flush()
+            call_command('loadgeojson', f.name, model='djgeojson.route', stdout=stdout)
+        self.assertEqual(Route.objects.count(), 2)
+        self.assertIn('Loaded 2 features', stdout.getvalue())
+
 
 class GeoJsonSerializerTest(TestCase):
 
@@ -157,6 +280,33 @@ class GeoJsonSerializerTest(TestCase):
         self.assertEqual(
             features, {"type": "FeatureCollection", "features": [{"geometry": {"type": "Point", "coordinates": [-1.36, -5.98]}, "type": "Feature", "properties": {}}]})
 
+    def test_precision_rounds_properties_and_bbox(self):
+        serializer = Serializer()
+        features = json.loads(serializer.serialize(
+            [{'geom': 'SRID=4326;POINT (1.2345 2.3456)', 'area': 3.14159}],
+            properties=['area'], precision=1, bbox=[1.2345, 2.3456, 3.4567, 4.5678],
+            bbox_auto=True, crs=False))
+        self.assertEqual(
+            features, {"type": "FeatureCollection", "bbox": [1.2, 2.3, 3.5, 4.6], "features": [{"geometry": {"type": "Point", "coordinates": [1.2, 2.3]}, "bbox": [1.2, 2.3, 1.2, 2.3], "type": "Feature", "properties": {"area": 3.1}}]})
+
+    def test_precision_is_thread_safe(self):
+        objects = [{'geom': 'SRID=4326;POINT (1.23456 1.23456)'}] * 20
+        results = {}
+
+        def serialize(precision):
+            outputs = set()
+            for i in range(20):
+                features = json.loads(Serializer().serialize(objects, precision=precision))
+                outputs.update(f['geometry']['coordinates'][0] for f in features['features'])
+            results[precision] = outputs
+
+        threads = [threading.Thread(target=serialize, args=(p,)) for p in range(1, 5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {1: {1.2}, 2: {1.23}, 3: {1.235}, 4: {1.2346}})
+
     def test_simplify(self):
         serializer = Serializer()
         features = json.loads(serializer.serialize(
@@ -238,6 +388,305 @@ class GeoJsonSerializerTest(TestCase):
                 }]
             })
 
+    def test_streaming_output_is_identical(self):
+        objects = [{'geom': 'SRID=2154;POINT (1 1)', 'name': 'green'},
+                   {'geom': 'SRID=4326;LINESTRING (1 1, 3 3)', 'name': 'blue'}]
+        for options in [{}, {'crs': False}, {'precision': 2},
+                        {'sort_keys': True, 'bbox': [1, 1, 3, 3]},
+                        {'separators': (',', ':'), 'bbox_auto': True}]:
+            buffered = Serializer().serialize(objects, **options)
+            streamed = Serializer().serialize(objects, streaming=True, **options)
+            self.assertEqual(buffered, streamed)
+
+    def test_streaming_does_not_keep_features(self):
+        Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        Route.objects.create(name='blue', geom="LINESTRING (0 0, 1 1)")
+        serializer = Serializer()
+        streamed = serializer.serialize(Route.objects.all(), properties=['name'],
+                                        streaming=True)
+        self.assertEqual(serializer.feature_collection['features'], [])
+        self.assertEqual(streamed, Serializer().serialize(Route.objects.all(),
+                                                          properties=['name']))
+
+    def test_iterserialize_yields_chunks_of_features(self):
+        objects = [{'geom': 'SRID=4326;POINT (%s 1)' % i} for i in range(5)]
+        chunks = list(Serializer().iterserialize(objects, chunk_size=2))
+        # header, 2 chunks of 2 features, last feature with footer
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(''.join(chunks), Serializer().serialize(objects))
+
+    def test_database_geojson(self):
+        Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        Route.objects.create(name='blue', geom="LINESTRING (0 0, 1 1.123456)")
+        serializer = Serializer()
+        features = json.loads(serializer.serialize(
+            Route.objects.all(), properties=['name'], precision=2,
+            database_geojson=True))
+        self.assertEqual(features, json.loads(Serializer().serialize(
+            Route.objects.all(), properties=['name'], precision=2)))
+
+    def test_database_geojson_is_decoded_if_keys_are_sorted(self):
+        route = Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        serializer = Serializer()
+        features = json.loads(serializer.serialize(
+            Route.objects.all(), properties=['name'], crs=False,
+            database_geojson=True, sort_keys=True))
+        self.assertEqual(
+            features, {"type": "FeatureCollection", "features": [{"geometry": {"type": "LineString", "coordinates": [[0.0, 0.0], [1.0, 1.0]]}, "type": "Feature", "properties": {"model": "djgeojson.route", "name": "green"}, "id": route.pk}]})
+
+    def test_database_geojson_needs_a_geometry_field(self):
+        route = Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        Sign.objects.create(label='A', route=route)
+        serializer = Serializer()
+        features = json.loads(serializer.serialize(
+            Sign.objects.all(), properties=['label'], database_geojson=True))
+        self.assertEqual(features['features'][0]['geometry'],
+                         {"type": "Point", "coordinates": [0.5, 0.5]})
+
+    def test_database_geojson_needs_postgis_or_spatialite(self):
+        Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        with mock.patch.object(connection.ops, 'postgis', False, create=True), \
+                mock.patch.object(connection.ops, 'spatialite', False, create=True):
+            with CaptureQueriesContext(connection) as queries:
+                features = json.loads(Serializer().serialize(
+                    Route.objects.all(), properties=['name'], database_geojson=True))
+        self.assertNotIn('djgeojson_geometry', queries[0]['sql'])
+        self.assertEqual(features, json.loads(Serializer().serialize(
+            Route.objects.all(), properties=['name'])))
+
+    def test_geometries_are_processed_by_database(self):
+        Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1, 1.01 1.01, 2 2)")
+        for options in [{'srid': 3857}, {'force2d': True, 'simplify': 0.1, 'bbox_auto': True}]:
+            with CaptureQueriesContext(connection) as queries:
+                features = json.loads(Serializer().serialize(
+                    Route.objects.all(), properties=['name'], precision=2, **options))
+            self.assertIn('djgeojson_geometry', queries[0]['sql'])
+            # Lists are processed in Python
+            python_features = json.loads(Serializer().serialize(
+                list(Route.objects.all()), properties=['name'], precision=2, **options))
+            self.assertEqual([(f['geometry'], f.get('bbox')) for f in features['features']],
+                             [(f['geometry'], f.get('bbox')) for f in python_features['features']])
+
+    def test_values(self):
+        Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        Route.objects.create(name='blue', geom="LINESTRING (0 0, 1 1.123456)")
+        for options in [{'properties': ['name']},
+                        {'properties': {'name': 'title'}, 'with_modelname': False},
+                        {'properties': ['id'], 'primary_key': 'name', 'precision': 2},
+                        {'properties': ['name'], 'database_geojson': True},
+                        {'properties': ['name', 'upper_name', 'countries']}]:
+            self.assertEqual(Serializer().serialize(Route.objects.all(), values=True, **options),
+                             Serializer().serialize(Route.objects.all(), **options))
+            self.assertEqual(''.join(Serializer().iterserialize(Route.objects.all(), values=True,
+                                                                **options)),
+                             Serializer().serialize(Route.objects.all(), **options))
+
+    def test_values_querysets(self):
+        Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        for options in [{}, {'properties': ['name'], 'database_geojson': True, 'srid': 3857},
+                        {'database_collection': True}]:
+            features = json.loads(Serializer().serialize(
+                Route.objects.values('name', 'geom'), **options))
+            self.assertEqual(features['features'][0]['properties'], {'name': 'green'})
+            self.assertEqual(''.join(Serializer().iterserialize(
+                Route.objects.values('name', 'geom'), **options)),
+                Serializer().serialize(Route.objects.values('name', 'geom'), **options))
+
+    def test_links(self):
+        links = [{'href': 'http://example.com/?after=1', 'rel': 'next'}]
+        for streaming in (False, True):
+            geojson = json.loads(Serializer().serialize(
+                [{'geom': 'POINT (1 2)'}], links=links, streaming=streaming))
+            self.assertEqual(geojson['links'], links)
+            self.assertEqual(len(geojson['features']), 1)
+
+    def test_values_fetches_only_properties_columns(self):
+        Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        with CaptureQueriesContext(connection) as queries:
+            Serializer().serialize(Route.objects.all(), properties=[], values=True)
+        self.assertNotIn('"name"', queries[0]['sql'])
+
+    @skipUnless(connection.vendor == 'postgresql', "PostGIS only")
+    def test_database_collection(self):
+        Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        Route.objects.create(name='blue', geom="LINESTRING (0 0, 1 1.123456)")
+        for options in [{'properties': ['name']},
+                        {'properties': {'name': 'title'}, 'with_modelname': False},
+                        {'properties': [], 'precision': 2, 'bbox_auto': True, 'srid': 3857},
+                        {'properties': ['id', 'name'], 'crs': False, 'bbox': [0, 0, 1, 1]}]:
+            queryset = Route.objects.order_by('pk')
+            features = json.loads(Serializer().serialize(
+                queryset, database_collection=True, **options))
+            expected = json.loads(Serializer().serialize(queryset, **options))
+            self.assertEqual(features.keys(), expected.keys())
+            self.assertEqual(features['features'][1]['properties'],
+                             expected['features'][1]['properties'])
+            self.assertEqual(features['features'][1]['id'], expected['features'][1]['id'])
+            for coords, expected_coords in zip(features['features'][1]['geometry']['coordinates'],
+                                               expected['features'][1]['geometry']['coordinates']):
+                self.assertAlmostEqual(coords[0], expected_coords[0], places=5)
+                self.assertAlmostEqual(coords[1], expected_coords[1], places=5)
+
+    def test_database_collection_falls_back_to_python(self):
+        route = Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        Sign.objects.create(label='A', route=route)
+        for queryset, options in [(Route.objects.all(), {'properties': ['countries']}),
+                                  (Route.objects.all(), {'properties': ['upper_name']}),
+                                  (Sign.objects.all(), {'properties': ['label']})]:
+            self.assertEqual(
+                Serializer().serialize(queryset, database_collection=True, **options),
+                Serializer().serialize(queryset, **options))
+
+    def test_serialization_plan_is_reused_for_same_model_and_options(self):
+        serializers = [Serializer(), Serializer(), Serializer()]
+        serializers[0].serialize(Route.objects.all(), properties=['name'])
+        serializers[1].serialize(Route.objects.all(), properties=['name'])
+        serializers[2].serialize(Route.objects.all(), properties=['name', 'upper_name'])
+        self.assertIs(serializers[0]._plan, serializers[1]._plan)
+        self.assertIsNot(serializers[0]._plan, serializers[2]._plan)
+        self.assertEqual(serializers[2]._plan.extras, ('upper_name',))
+
+    def test_subclasses_handle_field_is_called(self):
+        class UpperSerializer(Serializer):
+            def handle_field(self, obj, field_name):
+                super(UpperSerializer, self).handle_field(obj, field_name)
+                if field_name == 'name':
+                    self._current['properties']['name'] = self._current['properties']['name'].upper()
+
+        Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        for objects, options in [(Route.objects.all(), {}),
+                                 (Route.objects.all(), {'values': True}),
+                                 (list(Route.objects.all()), {})]:
+            features = json.loads(UpperSerializer().serialize(objects, properties=['name'],
+                                                              **options))
+            self.assertEqual(features['features'][0]['properties']['name'], 'GREEN')
+
+    def test_subclasses_handle_field_is_called_for_geometries(self):
+        class PointSerializer(Serializer):
+            def handle_field(self, obj, field_name):
+                super(PointSerializer, self).handle_field(obj, field_name)
+                if field_name == self.geometry_field:
+                    self._current['geometry'] = self._current['geometry'].centroid
+
+        Route.objects.create(name='green', geom="LINESTRING (0 0, 1 1)")
+        for options in [{}, {'database_geojson': True}, {'srid': 3857}]:
+            features = json.loads(PointSerializer().serialize(Route.objects.all(), **options))
+            self.assertEqual(features['features'][0]['geometry']['type'], 'Point')
+
+
+class GeometryEncodingTest(TestCase):
+
+    def test_geometries_are_read_from_wkb(self):
+        for wkt in ['POINT (1 2)',
+                    'POINT Z (1 2 3)',
+                    'LINESTRING (0 0, 1 1.5)',
+                    'POLYGON ((0 0, 1 1, 0 2, 0 0), (0.1 0.2, 0.3 0.3, 0.1 0.4, 0.1 0.2))',
+                    'MULTIPOINT (1 2, 3 4)',
+                    'MULTILINESTRING ((0 0, 1 1), (2 2, 3 3))',
+                    'MULTIPOLYGON (((0 0, 1 1, 0 2, 0 0)), ((5 5, 6 6, 5 7, 5 5)))',
+                    'GEOMETRYCOLLECTION (POINT Z (1 2 3), LINESTRING Z (3 4 5, 6 7 8))',
+                    'POLYGON EMPTY']:
+            geometry = GEOSGeometry(wkt, srid=4326)
+            self.assertEqual(json.loads(json.dumps(geometry_to_geojson(geometry))),
+                             json.loads(geometry.geojson))
+
+    def test_geometries_are_written_as_wkb(self):
+        for wkt in ['POINT (1 2)',
+                    'POINT Z (1 2 3)',
+                    'LINESTRING (0 0, 1 1.5)',
+                    'POLYGON ((0 0, 1 1, 0 2, 0 0), (0.1 0.2, 0.3 0.3, 0.1 0.4, 0.1 0.2))',
+                    'MULTIPOINT Z (1 2 3, 3 4 5)',
+                    'MULTILINESTRING ((0 0, 1 1), (2 2, 3 3))',
+                    'MULTIPOLYGON (((0 0, 1 1, 0 2, 0 0)), ((5 5, 6 6, 5 7, 5 5)))',
+                    'GEOMETRYCOLLECTION (POINT Z (1 2 3), LINESTRING Z (3 4 5, 6 7 8))',
+                    'POLYGON EMPTY']:
+            geometry = GEOSGeometry(wkt)
+            wkb = geojson_to_wkb(json.loads(geometry.geojson))
+            self.assertEqual(GEOSGeometry(memoryview(wkb)).wkt, geometry.wkt)
+
+    @skipUnless(numpy, "NumPy is not installed")
+    def test_numpy_coordinates_are_identical(self):
+        coordinates = [(i * 0.125 + 0.005, 1 / (i + 3.0), i * 1e-7) for i in range(40)]
+        for geometry in [LineString(coordinates, srid=4326),
+                         LineString([c[:2] for c in coordinates], srid=4326),
+                         Polygon(coordinates[:20] + coordinates[:1], srid=4326)]:
+            for precision in [None, 0, 2, 5, 9]:
+                with mock.patch('djgeojson.serializers.numpy', None):
+                    expected = json.dumps(geometry_to_geojson(geometry, precision))
+                self.assertEqual(json.dumps(geometry_to_geojson(geometry, precision)), expected)
+
+    def test_coordinates_are_not_truncated(self):
+        geometry = Point(0.1 + 0.2, 1 / 3.0, srid=4326)
+        self.assertEqual(geometry_to_geojson(geometry),
+                         {'type': 'Point', 'coordinates': [0.1 + 0.2, 1 / 3.0]})
+
+
+class GeometryTransformTest(TestCase):
+
+    def test_coord_transforms_are_reused_in_thread(self):
+        transforms = []
+        thread = threading.Thread(target=lambda: transforms.append(get_coord_transform(2154, 4326)))
+        thread.start()
+        thread.join()
+        self.assertIs(get_coord_transform(2154, 4326), get_coord_transform(2154, 4326))
+        self.assertIsNot(get_coord_transform(2154, 4326), transforms[0])
+        self.assertIsNot(get_coord_transform(2154, 4326), get_coord_transform(2154, 3857))
+
+    def test_geometries_are_transformed_at_once(self):
+        geometries = [GEOSGeometry(wkt, srid=2154) for wkt in [
+            'POINT (700000 6600000)',
+            'POINT Z (700000 6600000 10)',
+            'POLYGON ((700000 6600000, 700010 6600020, 700000 6600020, 700000 6600000))',
+            'GEOMETRYCOLLECTION (POINT (700000 6600000), LINESTRING (700000 6600000, 1 1))',
+            'POLYGON EMPTY']]
+        self.assertEqual(
+            json.loads(json.dumps(transform_geometries(geometries, 4326))),
+            [json.loads(json.dumps(geometry_to_geojson(g.transform(4326, clone=True))))
+             for g in geometries])
+
+    def test_features_are_reprojected_by_chunks(self):
+        objects = [{'geom': 'SRID=2154;POINT (700000 6600000)'},
+                   {'geom': 'SRID=3857;POINT (0 0)'}] * 3
+        expected = [{'type': 'Point', 'coordinates': [3.0, 46.5]},
+                    {'type': 'Point', 'coordinates': [0.0, 0.0]}] * 3
+        for streaming in (False, True):
+            with mock.patch('djgeojson.serializers.transform_geometries',
+                            wraps=transform_geometries) as transform:
+                features = json.loads(Serializer().serialize(
+                    objects, precision=6, chunk_size=4, streaming=streaming))
+            self.assertEqual([f['geometry'] for f in features['features']], expected)
+            # 2 SRIDs in 2 chunks
+            self.assertEqual(transform.call_count, 4)
+
+    def test_geometries_are_not_transformed_in_place(self):
+        route = Route(name='green', geom=GEOSGeometry('LINESTRING (0 0, 1 1)', srid=4326))
+        for options in [{}, {'bbox_auto': True}]:
+            features = json.loads(Serializer().serialize([route], srid=3857, **options))
+            self.assertNotEqual(features['features'][0]['geometry']['coordinates'][1], [1, 1])
+            self.assertEqual(route.geom.srid, 4326)
+            self.assertEqual(route.geom.coords, ((0, 0), (1, 1)))
+
+
+class HasattrLazyTest(TestCase):
+
+    def test_properties_are_not_evaluated(self):
+        class Lazy(object):
+            @property
+            def expensive(self):
+                raise AssertionError('Evaluated')
+        self.assertTrue(hasattr_lazy(Lazy(), 'expensive'))
+
+    def test_fields_annotations_and_attributes(self):
+        route = Route(name='green')
+        route.annotated = 1
+        for name in ('name', 'geom', 'countries', 'annotated', 'upper_name', 'picture'):
+            self.assertTrue(hasattr_lazy(route, name), name)
+        self.assertFalse(hasattr_lazy(route, 'missing'))
+
+    def test_dict_keys(self):
+        self.assertTrue(hasattr_lazy({'name': None}, 'name'))
+        self.assertFalse(hasattr_lazy({'name': None}, 'keys'))
+
 
 class ForeignKeyTest(TestCase):
 
@@ -361,6 +810,49 @@ class ReverseForeignkeyTest(TestCase):
             })
 
 
+class RelationsQueriesTest(TestCase):
+
+    def create_routes(self, count):
+        country = Country.objects.create(label='C', geom="POLYGON ((0 0,1 1,0 2,0 0))")
+        for i in range(count):
+            route = Route.objects.create(name='route', geom="LINESTRING (0 0, 1 1)")
+            route.countries.add(country)
+            Sign.objects.create(label='S', route=route)
+
+    def assertConstantQueries(self, num, queryset, **options):
+        for count in (2, 10):
+            self.create_routes(count)
+            with self.assertNumQueries(num):
+                Serializer().serialize(queryset.all(), **options)
+            with self.assertNumQueries(num):
+                list(Serializer().iterserialize(queryset.all(), chunk_size=3, **options))
+
+    def test_foreign_keys_natural_keys_are_selected(self):
+        self.assertConstantQueries(1, Sign.objects.all(), properties=['route'],
+                                   use_natural_keys=True)
+
+    def test_many_to_many_and_reverse_relations_are_prefetched(self):
+        self.assertConstantQueries(3, Route.objects.all(), properties=['countries', 'signs'])
+        self.assertConstantQueries(3, Route.objects.all(), properties=['countries', 'signs'],
+                                   use_natural_keys=True)
+
+    def test_lists_many_to_many_are_prefetched(self):
+        self.create_routes(5)
+        routes = list(Route.objects.all())
+        with self.assertNumQueries(1):
+            features = json.loads(Serializer().serialize(routes, properties=['name', 'countries']))
+        self.assertEqual(features['features'][0]['properties'],
+                         {'name': 'route', 'countries': [Country.objects.get().pk]})
+
+    def test_lists_foreign_keys_are_not_fetched(self):
+        self.create_routes(2)
+        signs = list(Sign.objects.select_related('route'))
+        with self.assertNumQueries(0):
+            features = json.loads(Serializer().serialize(signs, properties=['label', 'route']))
+        self.assertEqual(features['features'][0]['properties'],
+                         {'label': 'S', 'route': signs[0].route_id})
+
+
 class GeoJsonTemplateTagTest(TestCase):
 
     def setUp(self):
@@ -519,6 +1011,186 @@ class ViewsTest(TestCase):
         self.assertEqual(geojson['features'][0]['properties']['route'],
                          'green')
 
+    def test_view_can_stream_features(self):
+        class StreamedGeoJSON(GeoJSONLayerView):
+            properties = ['name']
+            streaming = True
+        view = StreamedGeoJSON(model=Route)
+        view.object_list = []
+        response = view.render_to_response(context={})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/geo+json')
+        geojson = json.loads(smart_str(b''.join(response.streaming_content)))
+        self.assertEqual(geojson['features'][0]['properties']['name'],
+                         'green')
+
+
+class Spot(models.Model):
+    geom = models.PointField(srid=4326)
+    updated_at = models.DateTimeField(auto_now=True)
+    updated_on = models.DateField(auto_now=True)
+
+
+class ConditionalViewTest(TestCase):
+    class SpotLayer(GeoJSONLayerView):
+        model = Spot
+        last_modified_field = 'updated_at'
+
+    def setUp(self):
+        Spot.objects.create(geom=Point(0, 0))
+
+    def get(self, **headers):
+        return self.SpotLayer.as_view()(RequestFactory().get('/spots.geojson', **headers))
+
+    def test_unchanged_layer_is_not_serialized(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(1):
+            response = self.get(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        response = self.get(HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_changed_layer_is_serialized(self):
+        etag = self.get()['ETag']
+        Spot.objects.create(geom=Point(1, 1))
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(json.loads(smart_str(response.content))['features']), 2)
+
+    @override_settings(TIME_ZONE='UTC')
+    def test_last_modified_date(self):
+        Spot.objects.update(updated_on=datetime.date(2024, 1, 2))
+        view = self.SpotLayer.as_view(last_modified_field='updated_on')
+        response = view(RequestFactory().get('/spots.geojson'))
+        self.assertEqual(response['Last-Modified'], 'Tue, 02 Jan 2024 00:00:00 GMT')
+
+    @override_settings(USE_TZ=False, TIME_ZONE='Europe/Paris')
+    def test_last_modified_local_time(self):
+        Spot.objects.update(updated_at=datetime.datetime(2024, 1, 2, 12, 0))
+        response = self.get()
+        self.assertEqual(response['Last-Modified'], 'Tue, 02 Jan 2024 11:00:00 GMT')
+
+    def test_replaced_objects_change_etag(self):
+        updated_at = Spot.objects.get().updated_at
+        Spot.objects.create(geom=Point(1, 1))
+        Spot.objects.update(updated_at=updated_at)
+        etag = self.get()['ETag']
+        # Same number of objects and latest modification
+        Spot.objects.latest('pk').delete()
+        Spot.objects.create(geom=Point(2, 2))
+        Spot.objects.update(updated_at=updated_at)
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_validators_are_optional(self):
+        response = GeoJSONLayerView.as_view(model=Spot)(RequestFactory().get('/spots.geojson'))
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+
+
+class BboxFilterViewTest(TestCase):
+    class RouteLayer(GeoJSONLayerView):
+        model = Route
+        properties = ['name']
+        bbox_filter = True
+        simplifications = {10: 0.01, 14: 0.001}
+
+    def setUp(self):
+        Route.objects.create(name='east', geom=LineString((0, 1), (10, 1)))
+        Route.objects.create(name='west', geom=LineString((0, -1), (-10, -1)))
+
+    def get(self, query, **attrs):
+        view = self.RouteLayer(**attrs)
+        view.request = RequestFactory().get('/routes.geojson', query)
+        view.object_list = []
+        response = view.render_to_response(context={})
+        return view, json.loads(smart_str(response.content))
+
+    def test_objects_are_filtered_by_bbox(self):
+        view, geojson = self.get({'bbox': '1,0,5,2'})
+        self.assertEqual([f['properties']['name'] for f in geojson['features']], ['east'])
+        self.assertEqual(geojson['bbox'], [1.0, 0.0, 5.0, 2.0])
+        view, geojson = self.get({})
+        self.assertEqual(len(geojson['features']), 2)
+
+    def test_geometries_can_be_trimmed_to_bbox(self):
+        view, geojson = self.get({'bbox': '1,0,5,2'}, trim_to_boundary=True)
+        self.assertEqual(geojson['features'][0]['geometry']['coordinates'],
+                         [[1.0, 1.0], [5.0, 1.0]])
+
+    def test_geometries_are_simplified_by_zoom(self):
+        view, geojson = self.get({'zoom': '12'})
+        self.assertEqual(view.simplify, 0.001)
+        view, geojson = self.get({'zoom': '15'})
+        self.assertIsNone(view.simplify)
+
+    def test_invalid_parameters(self):
+        for query in [{'bbox': '1,0,5'}, {'bbox': '5,0,1,2'}, {'bbox': 'a,b,c,d'}, {'zoom': 'z'},
+                      {'bbox': '0,0,1,1,999999'}, {'bbox': '0,0,inf,1'}, {'bbox': '0,0,1e20,1,3857'}]:
+            with self.assertRaises(SuspiciousOperation):
+                self.get(query)
+
+    def test_bbox_that_cannot_be_transformed(self):
+        with self.assertRaises(SuspiciousOperation):
+            self.get({'bbox': '0,0,1,100,4326'}, srid=3857)
+
+
+class KeysetPaginationViewTest(TestCase):
+    class RouteLayer(GeoJSONLayerView):
+        model = Route
+        properties = ['name']
+        page_size = 2
+
+    def setUp(self):
+        self.routes = [Route.objects.create(name='r%s' % i, geom="LINESTRING (0 0, 1 1)")
+                       for i in range(5)]
+
+    def get(self, query):
+        response = self.RouteLayer.as_view()(RequestFactory().get('/routes.geojson', query))
+        return json.loads(smart_str(response.content))
+
+    def test_pages_follow_primary_keys(self):
+        pages = []
+        query = {}
+        while query is not None:
+            geojson = self.get(query)
+            pages.append([f['id'] for f in geojson['features']])
+            links = {link['rel']: link['href'] for link in geojson['links']}
+            query = None
+            if 'next' in links:
+                query = QueryDict(links['next'].split('?')[1])
+        pks = [r.pk for r in self.routes]
+        self.assertEqual(pages, [pks[:2], pks[2:4], pks[4:]])
+
+    def test_page_is_a_range_of_primary_keys(self):
+        with CaptureQueriesContext(connection) as queries:
+            geojson = self.get({'after': self.routes[0].pk, 'limit': 3})
+        self.assertEqual([f['id'] for f in geojson['features']],
+                         [r.pk for r in self.routes[1:4]])
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn('OFFSET', queries[-1]['sql'])
+        next_link = [link for link in geojson['links'] if link['rel'] == 'next'][0]
+        self.assertIn('after=%s' % self.routes[3].pk, next_link['href'])
+
+    def test_last_page_is_bounded(self):
+        class RouteLayer(self.RouteLayer):
+            def paginate_keyset(self, qs):
+                qs = super(RouteLayer, self).paginate_keyset(qs)
+                Route.objects.create(name='new', geom="LINESTRING (0 0, 1 1)")
+                return qs
+
+        response = RouteLayer.as_view()(RequestFactory().get(
+            '/routes.geojson', {'after': self.routes[2].pk}))
+        geojson = json.loads(smart_str(response.content))
+        self.assertEqual([f['id'] for f in geojson['features']],
+                         [r.pk for r in self.routes[3:]])
+
+    def test_invalid_parameters(self):
+        for query in [{'limit': '0'}, {'limit': 'a'}, {'after': 'a'}]:
+            with self.assertRaises(SuspiciousOperation):
+                self.get(query)
+
 
 class TileEnvelopTest(TestCase):
     def setUp(self):
@@ -659,6 +1331,107 @@ class TiledGeoJSONViewTest(TestCase):
         self.view.get_queryset()
         self.assertEqual(self.view.simplify, 200)
 
+    def test_auto_simplification_is_the_size_of_a_pixel(self):
+        self.view.auto_simplify = True
+        self.view.args = [4, 8, 7]
+        self.view.get_queryset()
+        xmin, ymin, xmax, ymax = self.view.bbox
+        self.assertAlmostEqual(self.view.simplify, min(xmax - xmin, ymax - ymin) / 256)
+
+    def test_features_smaller_than_a_pixel_are_dropped(self):
+        tiny = Route.objects.create(geom=LineString((1, 1), (1.01, 1.01)))
+        self.view.auto_simplify = True
+        self.view.args = [4, 8, 7]
+        self.assertEqual(list(self.view.get_queryset()), [self.r1])
+        view = TiledGeoJSONLayerView(model=Route, auto_simplify=True, args=[12, 2059, 2036])
+        self.assertIn(tiny, view.get_queryset())
+
+    def test_auto_simplification_without_database_functions(self):
+        tiny = Route.objects.create(geom=LineString((1, 1), (1.01, 1.01)))
+        self.view.auto_simplify = True
+        self.view.args = [4, 8, 7]
+        with mock.patch.object(connection.ops, 'postgis', False, create=True), \
+                mock.patch.object(connection.ops, 'spatialite', False, create=True):
+            queryset = self.view.get_queryset()
+        xmin, ymin, xmax, ymax = self.view.bbox
+        self.assertAlmostEqual(self.view.simplify, min(xmax - xmin, ymax - ymin) / 256)
+        # Features are not dropped
+        self.assertIn(tiny, queryset)
+
+
+class MVTEncodingTest(TestCase):
+    """ Examples of the Mapbox Vector Tile specification 2.1 """
+    bounds = (0, 0, 4096, 4096)
+
+    def geometry(self, geom_type, coordinates):
+        def flip(coords):
+            if isinstance(coords[0], (list, tuple)):
+                return [flip(c) for c in coords]
+            return [coords[0], 4096 - coords[1]]
+        return {'type': geom_type, 'coordinates': flip(coordinates)}
+
+    def test_point(self):
+        geometry = self.geometry('Point', [25, 17])
+        self.assertEqual(encode_geometry(geometry, self.bounds), (1, [9, 50, 34]))
+
+    def test_multipoint(self):
+        geometry = self.geometry('MultiPoint', [[5, 7], [3, 2]])
+        self.assertEqual(encode_geometry(geometry, self.bounds), (1, [17, 10, 14, 3, 9]))
+
+    def test_linestring(self):
+        geometry = self.geometry('LineString', [[2, 2], [2, 10], [10, 10]])
+        self.assertEqual(encode_geometry(geometry, self.bounds),
+                         (2, [9, 4, 4, 18, 0, 16, 16, 0]))
+
+    def test_polygon(self):
+        geometry = self.geometry('Polygon', [[[3, 6], [8, 12], [20, 34], [3, 6]]])
+        self.assertEqual(encode_geometry(geometry, self.bounds),
+                         (3, [9, 6, 12, 18, 10, 12, 24, 44, 15]))
+
+    def test_multipolygon_rings_are_oriented(self):
+        # Exterior rings given counter-clockwise, interior ring clockwise
+        geometry = self.geometry('MultiPolygon', [
+            [[[0, 0], [0, 10], [10, 10], [10, 0], [0, 0]]],
+            [[[11, 11], [11, 20], [20, 20], [20, 11], [11, 11]],
+             [[13, 13], [17, 13], [17, 17], [13, 17], [13, 13]]],
+        ])
+        self.assertEqual(encode_geometry(geometry, self.bounds)[1], [
+            9, 0, 0, 26, 20, 0, 0, 20, 19, 0, 15,
+            9, 22, 2, 26, 18, 0, 0, 18, 17, 0, 15,
+            9, 4, 13, 26, 0, 8, 8, 0, 0, 7, 15,
+        ])
+
+    def test_collapsed_geometries_are_dropped(self):
+        geometry = self.geometry('LineString', [[2, 2], [2.1, 2.1]])
+        self.assertEqual(encode_geometry(geometry, self.bounds), (None, []))
+
+    def test_layer(self):
+        tile = encode_layer('spots', [
+            {'id': 1, 'properties': {'name': 'a'}, 'geometry': self.geometry('Point', [25, 17])},
+            {'properties': {}, 'geometry': None},
+        ], self.bounds)
+        self.assertEqual(tile, b'\x1a&x\x02\n\x05spots\x12\r\x08\x01\x12\x02\x00\x00'
+                               b'\x18\x01"\x03\t2"\x1a\x04name"\x03\n\x01a(\x80 ')
+
+
+class TiledMVTViewTest(TestCase):
+    def setUp(self):
+        self.view = TiledMVTLayerView(model=Route)
+        self.view.properties = ['name']
+        Route.objects.create(name='route', geom=LineString((0, 1), (10, 1)))
+
+    def test_view_is_serialized_as_vector_tile(self):
+        self.view.args = [4, 8, 7]
+        response = self.view.render_to_response(context={})
+        self.assertEqual(response['Content-Type'], 'application/vnd.mapbox-vector-tile')
+        self.assertIn(b'djgeojson.route', response.content)
+        self.assertIn(b'route', response.content.replace(b'djgeojson.route', b''))
+
+    def test_empty_tile_has_no_feature(self):
+        self.view.args = [4, 6, 8]
+        response = self.view.render_to_response(context={})
+        self.assertEqual(response.content, encode_layer('djgeojson.route', [], (0, 0, 1, 1)))
+
 
 class FixedSridPoint(models.Model):
 
@@ -682,6 +1455,184 @@ class TiledGeoJSONViewFixedSridTest(TestCase):
         self.assertAlmostEqual(geojson['features'][1]['geometry']['coordinates'][0], 6.846053240233331)
         self.assertAlmostEqual(geojson['features'][1]['geometry']['coordinates'][1], 52.77442791046052)
 
+    def test_points_sharing_a_pixel_are_dropped(self):
+        self.view.auto_simplify = True
+        self.view.args = [4, 8, 5]
+        self.assertEqual(list(self.view.get_queryset()), [self.p1])
+        self.view.args = [12, 2125, 1338]
+        self.assertEqual(len(self.view.get_queryset()), 2)
+
+
+class TileCacheTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.r1 = Route.objects.create(geom=LineString((0, 1), (10, 1)))
+        self.r2 = Route.objects.create(geom=LineString((0, -1), (-10, -1)))
+
+        class CachedTiles(TiledGeoJSONLayerView):
+            model = Route
+            tile_cache = TileCache(max_tiles=100)
+        self.view_class = CachedTiles
+
+    def render(self, z, x, y):
+        view = self.view_class()
+        view.args = [z, x, y]
+        return view.render_to_response(context={})
+
+    def test_tile_index_matches_tile_coord(self):
+        view = TiledGeoJSONLayerView()
+        lon, lat = view.tile_coord(8 + 0.5, 7 + 0.5, 4)
+        self.assertEqual(tile_index(lon, lat, 4), (8, 7))
+        self.assertEqual(tile_index(-180, 90, 4), (0, 0))
+        self.assertEqual(tile_index(180, -90, 4), (15, 15))
+
+    def test_cached_tile_is_served_without_query(self):
+        content = self.render(4, 8, 7).content
+        with self.assertNumQueries(0):
+            response = self.render(4, 8, 7)
+        self.assertEqual(response.content, content)
+        self.assertEqual(response['Content-Type'], 'application/geo+json')
+
+    def test_tiles_are_cached_by_options(self):
+        self.render(4, 8, 7)
+        self.view_class.properties = ['id']
+        with self.assertNumQueries(1):
+            response = self.render(4, 8, 7)
+        feature = json.loads(smart_str(response.content))['features'][0]
+        self.assertEqual(feature['properties'], {'id': self.r1.pk})
+
+    def test_tiles_are_cached_by_queryset(self):
+        class RouteTiles(self.view_class):
+            def get_queryset(self):
+                return super(RouteTiles, self).get_queryset().filter(pk=self.kwargs['pk'])
+
+        for route, count in [(self.r1, 1), (self.r2, 0), (self.r1, 1)]:
+            view = RouteTiles()
+            view.args, view.kwargs = [4, 8, 7], {'pk': route.pk}
+            geojson = json.loads(smart_str(view.render_to_response(context={}).content))
+            self.assertEqual(len(geojson['features']), count)
+
+    def test_tiles_beyond_max_zoom_are_not_cached(self):
+        self.view_class.tile_cache = TileCache(max_zoom=4)
+        x, y = tile_index(5, 1, 5)
+        self.render(5, x, y)
+        with self.assertNumQueries(1):
+            self.render(5, x, y)
+        self.view_class.tile_cache.set('layer', 5, x, y, {}, b'{}')
+        self.assertIsNone(self.view_class.tile_cache.get('layer', 5, x, y, {}))
+
+    def test_only_intersecting_tiles_are_invalidated(self):
+        self.render(4, 8, 7)
+        self.render(4, 7, 8)
+        self.view_class.invalidate_tiles(self.r1.geom)
+        with self.assertNumQueries(1):
+            self.render(4, 8, 7)
+        with self.assertNumQueries(0):
+            self.render(4, 7, 8)
+
+    def test_large_extents_invalidate_whole_zoom_levels(self):
+        self.render(4, 8, 7)
+        self.render(4, 7, 8)
+        self.view_class.invalidate_tiles((-180, -85, 180, 85))
+        with self.assertNumQueries(2):
+            self.render(4, 8, 7)
+            self.render(4, 7, 8)
+
+
+class LayerCacheTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.spot = Spot.objects.create(geom=Point(0, 0))
+
+        class CachedLayer(GeoJSONLayerView):
+            model = Spot
+            layer_cache = LayerCache()
+        self.view_class = CachedLayer
+
+    def get(self, **headers):
+        return self.view_class.as_view()(RequestFactory().get('/spots.geojson', **headers))
+
+    def test_compressed_layer_is_served_without_query(self):
+        response = self.get(HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        with self.assertNumQueries(0):
+            cached = self.get(HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached['ETag'], response['ETag'])
+        self.assertIn('Accept-Encoding', cached['Vary'])
+        geojson = json.loads(gzip.decompress(cached.content))
+        self.assertEqual(geojson['features'][0]['geometry']['coordinates'], [0.0, 0.0])
+
+    def test_layer_is_decompressed_for_other_clients(self):
+        content = gzip.decompress(self.get(HTTP_ACCEPT_ENCODING='gzip').content)
+        response = self.get()
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.content, content)
+
+    def test_unchanged_layer_is_not_sent(self):
+        etag = self.get()['ETag']
+        with self.assertNumQueries(0):
+            response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_encodings_have_their_own_etag(self):
+        etag = self.get()['ETag']
+        gzip_etag = self.get(HTTP_ACCEPT_ENCODING='gzip')['ETag']
+        self.assertNotEqual(gzip_etag, etag)
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=etag,
+                                  HTTP_ACCEPT_ENCODING='gzip').status_code, 200)
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=gzip_etag,
+                                  HTTP_ACCEPT_ENCODING='gzip').status_code, 304)
+
+    def test_layer_name_of_queryset(self):
+        class QuerysetLayer(GeoJSONLayerView):
+            queryset = Spot.objects.all()
+            layer_cache = LayerCache()
+        self.assertEqual(QuerysetLayer.get_layer_name(), 'djgeojson.spot')
+        QuerysetLayer.invalidate_layer()
+
+    def test_layer_is_invalidated(self):
+        self.get()
+        self.view_class.invalidate_layer()
+        with self.assertNumQueries(1):
+            self.get()
+        self.view_class.layer_cache.connect(Spot, self.view_class.get_layer_name())
+        Spot.objects.create(geom=Point(1, 1))
+        geojson = json.loads(smart_str(self.get().content))
+        self.assertEqual(len(geojson['features']), 2)
+
+    def test_layer_is_cached_with_last_modified_field(self):
+        self.view_class.last_modified_field = 'updated_at'
+        response = self.get()
+        with mock.patch.object(Serializer, 'serialize', autospec=True,
+                               side_effect=Serializer.serialize) as serialize:
+            with self.assertNumQueries(1):
+                cached = self.get()
+        self.assertFalse(serialize.called)
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(cached['ETag'], response['ETag'])
+        self.assertTrue(cached.has_header('Last-Modified'))
+
+    def test_layer_is_cached_by_queryset(self):
+        other = Spot.objects.create(geom=Point(1, 1))
+
+        class SpotLayer(self.view_class):
+            def get_queryset(self):
+                return super(SpotLayer, self).get_queryset().filter(pk=self.kwargs['pk'])
+
+        for spot in (self.spot, other, self.spot):
+            response = SpotLayer.as_view()(RequestFactory().get('/spots.geojson'), pk=spot.pk)
+            geojson = json.loads(smart_str(response.content))
+            self.assertEqual([f['id'] for f in geojson['features']], [spot.pk])
+
+    def test_encodings_are_negotiated(self):
+        cache = LayerCache(encodings=['gzip'])
+        layer = cache.set('layer', {}, b'{}')
+        self.assertEqual(cache.negotiate(layer, 'br, gzip;q=0.5')[0], 'gzip')
+        self.assertEqual(cache.negotiate(layer, '*')[0], 'gzip')
+        self.assertEqual(cache.negotiate(layer, 'gzip;q=0, identity'), (None, b'{}'))
+
 
 class Address(models.Model):
     geom = GeoJSONField()
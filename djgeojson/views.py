@@ -1,14 +1,31 @@
+import datetime
+import hashlib
+import json
 import math
+from calendar import timegm
 
 import django
 from django.core.exceptions import ImproperlyConfigured
 
 try:
-    from django.contrib.gis.db.models.functions import Intersection
+    from django.contrib.gis.db.models.functions import Intersection, SnapToGrid
+
+    from .functions import bbox_size
 except (ImportError, ImproperlyConfigured):
-    Intersection = None
-from django.core.exceptions import ImproperlyConfigured, SuspiciousOperation
+    Intersection = SnapToGrid = bbox_size = None
+from django.core.exceptions import (
+    EmptyResultSet,
+    FieldDoesNotExist,
+    ImproperlyConfigured,
+    SuspiciousOperation,
+    ValidationError,
+)
+from django.db import connections
+from django.db.models import Count, IntegerField, Max, Min, Q, QuerySet, Sum
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
 from django.utils.decorators import method_decorator
+from django.utils.http import http_date, quote_etag
 from django.views.decorators.gzip import gzip_page
 from django.views.generic import ListView
 
@@ -21,20 +38,48 @@ except (ImportError, ImproperlyConfigured):
         from .nogeos import Polygon
 
 try:
-    from django.contrib.gis.db.models import PointField
+    from django.contrib.gis.gdal import GDALException, SpatialReference
+    from django.contrib.gis.geos import GEOSException
+    TRANSFORM_ERRORS = (GDALException, GEOSException)
+except (ImportError, ImproperlyConfigured):
+    SpatialReference = None
+    TRANSFORM_ERRORS = ()
+
+try:
+    from django.contrib.gis.db.models import GeometryField, PointField
 except (ImportError, ImproperlyConfigured):
     from .fields import PointField
+    GeometryField = None
 
 from . import GEOJSON_DEFAULT_SRID
-from .http import HttpGeoJSONResponse
+from .http import (
+    HttpGeoJSONResponse,
+    HttpGeoJSONStreamingResponse,
+    HttpMVTResponse,
+)
+from .mvt import Serializer as MVTSerializer
+from .mvt import tile_bounds
 from .serializers import Serializer as GeoJSONSerializer
 
+# Beyond any coordinate system (infinite and huge values stall PROJ)
+MAX_BBOX_COORDINATE = 1e9
+
+
+def extent_polygon(xmin, ymin, xmax, ymax, srid):
+    """ Returns the polygon of an extent """
+    polygon = Polygon(((xmin, ymax), (xmax, ymax),
+                       (xmax, ymin), (xmin, ymin), (xmin, ymax)))
+    polygon.srid = srid
+    return polygon
+
 
 class GeoJSONResponseMixin(object):
     """
     A mixin that can be used to render a GeoJSON response.
     """
     response_class = HttpGeoJSONResponse
+    streaming_response_class = HttpGeoJSONStreamingResponse
+    serializer_class = GeoJSONSerializer
     """ Select fields for properties """
     properties = []
     """ Limit float precision """
@@ -57,47 +102,330 @@ class GeoJSONResponseMixin(object):
     with_modelname = True
 
     crs_type = 'name'
+    """ Stream features while the queryset is read """
+    streaming = False
+    """ Number of objects fetched (and features sent) at once when streaming """
+    chunk_size = 2000
+    """ Build geometries GeoJSON in the database (PostGIS or SpatiaLite) """
+    database_geojson = False
+    """ Build the whole collection with a single query (PostGIS) """
+    database_collection = False
+    """ Fetch only the columns of the properties (``values_list()``) """
+    values = False
+    """ Field of the last modification (e.g. ``updated_at``), for conditional responses """
+    last_modified_field = None
+    """ Links of the collection (e.g. to the next page) """
+    links = None
 
     def render_to_response(self, context, **response_kwargs):
         """
         Returns a JSON response, transforming 'context' to make the payload.
         """
-        serializer = GeoJSONSerializer()
+        # Queryset already obtained by ``ListView.get()``
+        queryset = getattr(self, 'object_list', None)
+        if not isinstance(queryset, QuerySet):
+            queryset = self.get_queryset()
+        options = self.get_serializer_options()
+        etag, last_modified = self.get_validators(queryset, options)
+        response = None
+        if etag is not None or last_modified is not None:
+            response = get_conditional_response(self.request, etag=etag,
+                                                last_modified=last_modified)
+        if response is None:
+            response = self.render_queryset(queryset, options, **response_kwargs)
+        if etag is not None and not response.has_header('ETag'):
+            response.headers['ETag'] = etag
+        if last_modified is not None and not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_validators(self, queryset, options):
+        """
+        Returns the ETag and the last modification timestamp of the layer,
+        computed without serializing it (``(None, None)`` to always serialize).
+        By default, from the latest ``last_modified_field``, the number of
+        objects and the sum of their integer primary keys. Changes that leave
+        all three unchanged (e.g. objects deleted and created with the same
+        sum of keys, without any later modification) are not noticed.
+        """
+        if self.last_modified_field is None:
+            return None, None
+        aggregates = dict(last_modified=Max(self.last_modified_field), count=Count('pk'))
+        if isinstance(queryset.model._meta.pk, IntegerField):
+            # Deleted and created objects
+            aggregates['checksum'] = Sum('pk')
+        state = queryset.aggregate(**aggregates)
+        encoded = json.dumps([state['last_modified'], state['count'], state.get('checksum'), options],
+                             sort_keys=True, default=str)
+        last_modified = state['last_modified']
+        if last_modified is not None:
+            if not isinstance(last_modified, datetime.datetime):
+                # DateField
+                last_modified = datetime.datetime.combine(last_modified, datetime.time.min)
+            if timezone.is_naive(last_modified):
+                # Local time, with USE_TZ = False
+                last_modified = timezone.make_aware(last_modified)
+            last_modified = timegm(last_modified.utctimetuple())
+        return quote_etag(hashlib.md5(encoded.encode('utf-8')).hexdigest()), last_modified
+
+    def render_queryset(self, queryset, options, **response_kwargs):
+        """
+        Returns the response serializing the queryset with these options.
+        """
+        serializer = self.serializer_class()
+        if self.streaming:
+            content = serializer.iterserialize(queryset, ensure_ascii=False,
+                                               chunk_size=self.chunk_size,
+                                               **options)
+            return self.streaming_response_class(content, **response_kwargs)
+
         response = self.response_class(**response_kwargs)
-        queryset = self.get_queryset()
-
-        options = dict(properties=self.properties,
-                       precision=self.precision,
-                       simplify=self.simplify,
-                       srid=self.srid,
-                       geometry_field=self.geometry_field,
-                       force2d=self.force2d,
-                       bbox=self.bbox,
-                       bbox_auto=self.bbox_auto,
-                       use_natural_keys=self.use_natural_keys,
-                       with_modelname=self.with_modelname,
-                       crs_type=self.crs_type)
         serializer.serialize(queryset, stream=response, ensure_ascii=False,
                              **options)
         return response
 
+    def get_serializer_options(self):
+        """
+        Returns the serializer options, once the queryset is obtained.
+        """
+        return dict(properties=self.properties,
+                    precision=self.precision,
+                    simplify=self.simplify,
+                    srid=self.srid,
+                    geometry_field=self.geometry_field,
+                    force2d=self.force2d,
+                    bbox=self.bbox,
+                    bbox_auto=self.bbox_auto,
+                    use_natural_keys=self.use_natural_keys,
+                    with_modelname=self.with_modelname,
+                    crs_type=self.crs_type,
+                    database_geojson=self.database_geojson,
+                    database_collection=self.database_collection,
+                    values=self.values,
+                    links=self.links)
+
 
 class GeoJSONLayerView(GeoJSONResponseMixin, ListView):
     """
     A generic view to serve a model as a layer.
     """
+    """ Cache of the whole layer, compressed (e.g. ``LayerCache()``) """
+    layer_cache = None
+    """ Name of the layer in the caches (default to model label) """
+    layer_name = None
+    """ Filter objects with the ``bbox=xmin,ymin,xmax,ymax[,srid]`` query parameter """
+    bbox_filter = False
+    """ Lookup of the bbox filter (e.g. ``bboverlaps`` to compare bounding boxes only) """
+    bbox_lookup = 'intersects'
+    """ Trim geometries to the bbox """
+    trim_to_boundary = False
+    """ Simplify geometries by zoom level (dict <int:float>) """
+    simplifications = None
+    """ Number of features by page, with ``limit`` and ``after`` query parameters """
+    page_size = None
+    """ Maximum number of features by page """
+    max_page_size = 10000
+
     @method_decorator(gzip_page)
     def dispatch(self, *args, **kwargs):
         return super(GeoJSONLayerView, self).dispatch(*args, **kwargs)
 
+    def get_queryset(self):
+        qs = super(GeoJSONLayerView, self).get_queryset()
+        if self.bbox_filter:
+            bbox, zoom = self._parse_bbox_params()
+            if bbox is not None:
+                qs = self.filter_bbox(qs, bbox)
+            if zoom is not None and self.simplifications:
+                self.simplify = self.get_simplification(zoom)
+        if self.page_size:
+            qs = self.paginate_keyset(qs)
+        return qs
+
+    def paginate_keyset(self, qs):
+        """
+        Returns the page of objects following the ``after`` primary key, in
+        the order of primary keys, and sets the ``links`` of the collection
+        to this page and the next one (as in OGC API Features). Pages are
+        range scans of the primary key index, whatever their position.
+        """
+        params = self.request.GET
+        try:
+            limit = min(int(params.get('limit', self.page_size)), self.max_page_size)
+            if limit < 1:
+                raise ValueError(limit)
+            qs = qs.order_by('pk')
+            if params.get('after'):
+                qs = qs.filter(pk__gt=params['after'])
+            pks = list(qs.values_list('pk', flat=True)[:limit + 1])
+        except (ValueError, TypeError, ValidationError):
+            # Raise suspicious, Django will return ``400 Bad Request``.
+            raise SuspiciousOperation("limit and after parameters could not be processed.")
+
+        self.links = [self._page_link('self', params)]
+        if pks:
+            # Rows inserted meanwhile are left to the next pages
+            qs = qs.filter(pk__lte=pks[:limit][-1])
+        if len(pks) > limit:
+            params = params.copy()
+            params['limit'] = limit
+            params['after'] = pks[limit - 1]
+            self.links.append(self._page_link('next', params))
+        return qs
+
+    def _page_link(self, rel, params):
+        return {'href': self.request.build_absolute_uri('?' + params.urlencode()),
+                'rel': rel,
+                'type': 'application/geo+json'}
+
+    def _parse_bbox_params(self):
+        bbox, zoom = self.request.GET.get('bbox'), self.request.GET.get('zoom')
+        try:
+            if zoom is not None:
+                zoom = int(zoom)
+            if bbox is not None:
+                values = bbox.split(',')
+                if len(values) not in (4, 5):
+                    raise ValueError(bbox)
+                coords = [float(v) for v in values[:4]]
+                xmin, ymin, xmax, ymax = coords
+                if not (xmin <= xmax and ymin <= ymax and
+                        all(abs(c) <= MAX_BBOX_COORDINATE for c in coords)):
+                    raise ValueError(bbox)
+                srid = self.srid
+                if len(values) == 5:
+                    srid = int(values[4])
+                    if SpatialReference is not None:
+                        # Unknown SRID
+                        SpatialReference(srid)
+                bbox = extent_polygon(xmin, ymin, xmax, ymax, srid)
+        except (ValueError,) + TRANSFORM_ERRORS:
+            # Raise suspicious, Django will return ``400 Bad Request``.
+            raise SuspiciousOperation("bbox and zoom parameters could not be processed.")
+        return bbox, zoom
+
+    def filter_bbox(self, qs, bbox):
+        """
+        Returns the objects of the queryset intersecting the bbox polygon,
+        with their geometries trimmed to it if ``trim_to_boundary``.
+        """
+        qs = qs.filter(**{
+            '%s__%s' % (self.geometry_field, self.bbox_lookup): bbox
+        })
+        if bbox.srid != self.srid:
+            try:
+                self.bbox = bbox.transform(self.srid, clone=True).extent
+            except TRANSFORM_ERRORS:
+                raise SuspiciousOperation("bbox could not be transformed to SRID %s." % self.srid)
+        else:
+            self.bbox = bbox.extent
+
+        # Won't trim point geometries to a boundary
+        model_field = qs.model._meta.get_field(self.geometry_field)
+        self.trim_to_boundary = (self.trim_to_boundary and
+                                 not isinstance(model_field, PointField) and
+                                 Intersection is not None)
+        if self.trim_to_boundary:
+            if django.VERSION < (1, 9):
+                qs = qs.intersection(bbox)
+            else:
+                qs = qs.annotate(intersection=Intersection(self.geometry_field, bbox))
+            self.geometry_field = 'intersection'
+        return qs
+
+    def get_simplification(self, zoom):
+        """ Returns the tolerance of ``simplifications`` at zoom, or at the nearest zoom above """
+        simplifications = self.simplifications or {}
+        levels = [z for z, simplify in simplifications.items()
+                  if zoom <= z <= 32 and simplify is not None]
+        return simplifications[min(levels)] if levels else None
+
+    @classmethod
+    def get_layer_name(cls, model=None):
+        model = model or cls.model or cls.queryset.model
+        return cls.layer_name or model._meta.label_lower
+
+    @classmethod
+    def invalidate_layer(cls):
+        """
+        Evict the cached layer, e.g. from the ``post_save`` and ``post_delete``
+        signals of the model (see ``LayerCache.connect()``).
+        """
+        if cls.layer_cache is not None:
+            cls.layer_cache.invalidate(cls.get_layer_name())
+
+    def get_layer_variant(self, queryset, options, etag=None):
+        """
+        Returns what identifies the cached layer of the queryset: the
+        serializer options, the SQL query (e.g. filtered by URL arguments
+        or by user), and the ETag of ``last_modified_field``.
+        """
+        try:
+            query = str(queryset.query)
+        except EmptyResultSet:
+            query = None
+        return dict(options, query=query, etag=etag)
+
+    def get_validators(self, queryset, options):
+        etag, last_modified = super(GeoJSONLayerView, self).get_validators(queryset, options)
+        self._cached_layer = None
+        if self.layer_cache is None:
+            return etag, last_modified
+        self._layer_variant = self.get_layer_variant(queryset, options, etag)
+        self._cached_layer = self.layer_cache.get(self.get_layer_name(queryset.model),
+                                                  self._layer_variant)
+        if self.last_modified_field is None:
+            etag, last_modified = (self._cached_layer or {}).get('etag'), None
+        if etag is not None:
+            # One validator per content encoding
+            encoding = self.layer_cache.get_encoding(self.request.META.get('HTTP_ACCEPT_ENCODING', ''))
+            etag = self.layer_cache.get_etag(etag, encoding)
+        return etag, last_modified
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super(GeoJSONLayerView, self).render_to_response(context, **response_kwargs)
+        if self.layer_cache is not None:
+            # Also for 304 Not Modified responses
+            patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+    def render_queryset(self, queryset, options, **response_kwargs):
+        if self.layer_cache is None:
+            return super(GeoJSONLayerView, self).render_queryset(
+                queryset, options, **response_kwargs)
+
+        layer = getattr(self, '_cached_layer', None)
+        if layer is None:
+            variant = getattr(self, '_layer_variant', None)
+            if variant is None:
+                variant = self.get_layer_variant(queryset, options)
+            response = super(GeoJSONLayerView, self).render_queryset(
+                queryset, options, **response_kwargs)
+            if response.streaming:
+                content = b''.join(response.streaming_content)
+            else:
+                content = response.content
+            layer = self.layer_cache.set(self.get_layer_name(queryset.model), variant, content)
+
+        encoding, content = self.layer_cache.negotiate(
+            layer, self.request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        response = self.response_class(content=content, **response_kwargs)
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        if self.last_modified_field is None:
+            response.headers['ETag'] = self.layer_cache.get_etag(layer['etag'], encoding)
+        return response
+
 
 class TiledGeoJSONLayerView(GeoJSONLayerView):
     width = 256
     height = 256
     tile_srid = 3857
     trim_to_boundary = True
-    """Simplify geometries by zoom level (dict <int:float>)"""
-    simplifications = None
+    """ Simplify geometries to the size of a pixel, and drop smaller features (PostGIS or SpatiaLite) """
+    auto_simplify = False
+    """ Cache of tiles (e.g. ``TileCache()``) """
+    tile_cache = None
 
     def tile_coord(self, xtile, ytile, zoom):
         """
@@ -133,33 +461,109 @@ class TiledGeoJSONLayerView(GeoJSONLayerView):
         self.z, self.x, self.y = self._parse_args()
         nw = self.tile_coord(self.x, self.y, self.z)
         se = self.tile_coord(self.x + 1, self.y + 1, self.z)
-        bbox = Polygon((nw, (se[0], nw[1]),
-                       se, (nw[0], se[1]), nw))
-        bbox.srid = self.srid
+        bbox = extent_polygon(nw[0], se[1], se[0], nw[1], self.srid)
         qs = super(TiledGeoJSONLayerView, self).get_queryset()
-        qs = qs.filter(**{
-            '%s__intersects' % self.geometry_field: bbox
-        })
-        self.bbox = bbox.extent
 
         # Simplification dict by zoom level
-        simplifications = self.simplifications or {}
-        z = self.z
-        self.simplify = simplifications.get(z)
-        while self.simplify is None and z < 32:
-            z += 1
-            self.simplify = simplifications.get(z)
-
-        # Won't trim point geometries to a boundary
-        model_field = qs.model._meta.get_field(self.geometry_field)
-        self.trim_to_boundary = (self.trim_to_boundary and
-                                 not isinstance(model_field, PointField) and
-                                 Intersection is not None)
-        if self.trim_to_boundary:
-            if django.VERSION < (1, 9):
-                qs = qs.intersection(bbox)
-            else:
-                qs = qs.annotate(intersection=Intersection(self.geometry_field, bbox))
-            self.geometry_field = 'intersection'
+        self.simplify = self.get_simplification(self.z)
 
+        geometry_field = self.geometry_field
+        qs = self.filter_bbox(qs, bbox)
+        if self.auto_simplify:
+            qs = self.simplify_to_resolution(qs, bbox, geometry_field)
         return qs
+
+    def simplify_to_resolution(self, qs, bbox, geometry_field):
+        """
+        Simplify geometries with the size of a pixel of the tile (unless set
+        in ``simplifications``), in the projection of the geometry field, and
+        drop the features smaller than a pixel: lines and polygons, and
+        points sharing a pixel with another one.
+        """
+        try:
+            field = qs.model._meta.get_field(geometry_field)
+        except FieldDoesNotExist:
+            return qs
+        if GeometryField is None or not isinstance(field, GeometryField):
+            return qs
+
+        if bbox.srid != field.srid:
+            bbox = bbox.transform(field.srid, clone=True)
+        xmin, ymin, xmax, ymax = bbox.extent
+        resolution = min((xmax - xmin) / self.width, (ymax - ymin) / self.height)
+        if self.simplify is None:
+            self.simplify = resolution
+
+        connection = connections[qs.db]
+        if bbox_size is None or not (getattr(connection.ops, 'postgis', False) or
+                                     getattr(connection.ops, 'spatialite', False)):
+            # Geometries are only simplified
+            return qs
+
+        if isinstance(field, PointField):
+            # First point of every pixel
+            pixels = qs.annotate(djgeojson_pixel=SnapToGrid(geometry_field, resolution))
+            return qs.filter(pk__in=pixels.values('djgeojson_pixel').annotate(
+                djgeojson_pk=Min('pk')).values('djgeojson_pk'))
+        # Points of other geometry fields have a size of 0
+        return qs.alias(djgeojson_size=bbox_size(geometry_field)).filter(
+            Q(djgeojson_size__gte=resolution) | Q(djgeojson_size=0))
+
+    @classmethod
+    def invalidate_tiles(cls, geometry):
+        """
+        Evict the cached tiles intersecting the geometry, e.g. from the
+        ``post_save`` and ``post_delete`` signals of the model.
+        """
+        if cls.tile_cache is not None:
+            cls.tile_cache.invalidate(cls.get_layer_name(), geometry)
+
+    def render_queryset(self, queryset, options, **response_kwargs):
+        if self.tile_cache is None:
+            return super(TiledGeoJSONLayerView, self).render_queryset(
+                queryset, options, **response_kwargs)
+
+        tile = (self.get_layer_name(queryset.model), self.z, self.x, self.y)
+        # Tiles of querysets filtered differently are cached apart
+        variant = self.get_layer_variant(queryset, options)
+        content = self.tile_cache.get(*tile, options=variant)
+        if content is not None:
+            return self.response_class(content=content, **response_kwargs)
+
+        response = super(TiledGeoJSONLayerView, self).render_queryset(
+            queryset, options, **response_kwargs)
+        if not response.streaming:
+            self.tile_cache.set(*tile, options=variant, content=response.content)
+        return response
+
+
+class TiledMVTLayerView(TiledGeoJSONLayerView):
+    """
+    A tiled layer view, serving Mapbox Vector Tiles.
+    """
+    response_class = HttpMVTResponse
+    serializer_class = MVTSerializer
+    """ Tiles are built at once """
+    streaming = False
+    """ Size of the tile grid """
+    extent = 4096
+    """ Size of the margin around tiles, in grid units (PostGIS) """
+    buffer = 64
+    """ Encode tiles with PostGIS ``ST_AsMVT()`` """
+    database_collection = True
+
+    def get_queryset(self):
+        if self.database_collection and self.trim_to_boundary:
+            queryset = self.queryset if self.queryset is not None else self.model._default_manager.all()
+            if getattr(connections[queryset.db].ops, 'postgis', False):
+                # Geometries are clipped by ST_AsMVTGeom()
+                self.trim_to_boundary = False
+        return super(TiledMVTLayerView, self).get_queryset()
+
+    def render_queryset(self, queryset, options, **response_kwargs):
+        options = dict(options,
+                       layer_name=self.get_layer_name(queryset.model),
+                       tile_bounds=tile_bounds(self.z, self.x, self.y),
+                       extent=self.extent,
+                       buffer=self.buffer)
+        return super(TiledMVTLayerView, self).render_queryset(queryset, options, **response_kwargs)
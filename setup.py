@@ -21,6 +21,8 @@ setup(
     ],
     extras_require={
         'field': ['django-leaflet>=0.12'],
+        'numpy': ['numpy'],
+        'compression': ['brotli', 'zstandard; python_version < "3.14"'],
         'docs': ['sphinx', 'sphinx-autobuild'],
     },
     packages=find_packages(),